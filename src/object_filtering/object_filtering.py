@@ -1,22 +1,34 @@
 # (c) 2024 Scott Ratchford
 # This file is licensed under the MIT License. See LICENSE.txt for details.
 
+import copy
 import functools
+import json
+import keyword
+import operator
+import re
+import sys
+from dataclasses import dataclass
 from decimal import Decimal
 from inspect import getmro
-from sys import getsizeof
 from typing import Any, Callable, Iterable
-from math import isclose
+from math import isclose, isfinite
 
 import numpy as np
 
 
-ABS_TOL = Decimal(0.0001)
+ABS_TOL = Decimal("0.0001")
+_ABS_TOL_F = float(ABS_TOL)    # math.isclose and NumPy would otherwise convert ABS_TOL on every call
+DEFAULT_SELECTIVITY = 0.5   # estimated fraction of objects for which an expression evaluates to True
+METHOD_RULE_COST = 2    # estimated cost of a rule that calls a method, relative to reading an attribute
+MAX_FILTER_SIZE = 102400    # bytes of JSON
 VALID_OPERATORS = set(["<", "<=", "==", "!=", ">=", ">"])
 VALID_LOGICAL_OPERATORS = set(["and", "or"])
 VALID_MULTI_VALUE_BEHAVIORS = set(["none", "add", "each_meets_criterion", "each_equal_in_object"])
 
 class ObjectFilter(dict):
+    __slots__ = ()  # the expression is stored in the dict's items, so instances need no __dict__
+
     def __init__(self, name: str = "", description: str = "", priority: int = 0, object_types: list = ["object"], logical_expression: bool | dict = True) -> None:
         super().__init__()
         self["name"] = name
@@ -26,7 +38,9 @@ class ObjectFilter(dict):
         self["logical_expression"] = logical_expression
 
 class Rule(dict):
-    def __init__(self, criterion: str = "__class__", operator: str = "==", comparison_value: int | float | str | bool = "", parameters: list = [], multi_value_behavior: str = "none") -> None:
+    __slots__ = ()
+
+    def __init__(self, criterion: str = "__class__", operator: str = "==", comparison_value: int | float | str | bool = "", parameters: list | tuple = (), multi_value_behavior: str = "none") -> None:
         super().__init__()
         self["criterion"] = criterion
         self["operator"] = operator
@@ -35,12 +49,16 @@ class Rule(dict):
         self["multi_value_behavior"] = multi_value_behavior
 
 class GroupExpression(dict):
+    __slots__ = ()
+
     def __init__(self, logical_operator: str = "and", logical_expressions: list = []) -> None:
         super().__init__()
         self["logical_operator"] = logical_operator
         self["logical_expressions"] = logical_expressions
 
 class ConditionalExpression(dict):
+    __slots__ = ()
+
     def __init__(self, if_branch: bool | dict = True, then_branch: bool | dict = True, else_branch: bool | dict = True) -> None:
         super().__init__()
         self["if"] = if_branch
@@ -49,54 +67,149 @@ class ConditionalExpression(dict):
 
 LogicalExpression = bool | Rule | ConditionalExpression | GroupExpression | ObjectFilter
 
-def filter_criterion(func):
+@functools.cache
+def _import_numba() -> Any:
+    """Imports numba on first use, since importing it takes longer than importing this module. Returns None if numba is not installed, in which case array filters are evaluated with NumPy alone."""
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+def _column_twin(twin: Callable[..., np.ndarray], columns: tuple[str, ...]) -> Callable[..., np.ndarray]:
+    """Adapts a twin that takes one array per attribute in columns into a twin that takes a mapping of columns.
+
+    If numba is installed, it is imported and the twin is compiled with `numba.njit` on its first call with at least NUMBA_MIN_ARRAY_SIZE objects. Smaller calls, calls with object arrays, and calls that numba cannot compile use the twin as plain NumPy code. Argument types that numba failed to compile are not compiled again.
+    """
+    jitted = None
+    failed_signatures = set()
+
+    def call_twin(cols: dict[str, np.ndarray], *parameters, **kwargs) -> np.ndarray:
+        nonlocal jitted
+        arrays = [cols[column] for column in columns]
+        numba = _import_numba() if arrays and len(arrays[0]) >= NUMBA_MIN_ARRAY_SIZE and all(array.dtype != object for array in arrays) else None
+        if numba is not None:
+            signature = (tuple(array.dtype for array in arrays), tuple(map(type, parameters)), tuple((name, type(value)) for name, value in kwargs.items()))
+            if signature not in failed_signatures:
+                if jitted is None:
+                    try:
+                        jitted = numba.njit(cache=True, error_model="numpy")(twin)  # NumPy's semantics, e.g. division by zero gives inf
+                    except RuntimeError:    # numba cannot cache twins without a source file, e.g. ones defined with exec
+                        jitted = numba.njit(error_model="numpy")(twin)
+                try:
+                    return jitted(*arrays, *parameters, **kwargs)
+                except numba.core.errors.NumbaError:    # code or argument types numba does not support
+                    failed_signatures.add(signature)
+        return twin(*arrays, *parameters, **kwargs)
+    return call_twin
+
+def filter_criterion(func: Callable | None = None, *, vectorized: Callable[..., np.ndarray] | None = None, columns: tuple[str, ...] | None = None):
     """Decorator that whitelists method use for filters.
+
+    Use `@filter_criterion(vectorized=twin)` to also register a vectorized twin of the method. `twin(columns, *parameters)` receives a mapping from attribute names to NumPy arrays of that attribute for each object in an `ObjectWrapper`, and returns an array with the method's result for each object. Attributes that are all floats are float64 arrays, and other attributes are object arrays of their values, so ints are not limited to int64. The twin must compute the same values as the method. An `ObjectWrapper` calls the twin once instead of calling the method on each object, if all of its objects share the twin.
+
+    If `columns` is also given, the twin instead receives one array per attribute named in `columns`, followed by the parameters, e.g. `@filter_criterion(vectorized=lambda x, y, z: x * y * z, columns=("x", "y"))`. Such twins are compiled with numba for large arrays of floats if it is installed.
     """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, **kwargs)
-    wrapper._is_whitelisted = True
-    return wrapper
+    twin = vectorized if vectorized is None or columns is None else _column_twin(vectorized, tuple(columns))
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+        wrapper._is_whitelisted = True
+        wrapper._vectorized = twin
+        return wrapper
+
+    if func is None:
+        return decorate
+    return decorate(func)
 
 """
 Helper and Sanitization Functions
 """
 
-def type_name_matches(obj: Any, target_type_names: Iterable[str]) -> bool:
-    """Evaluates whether obj is an instance of a class with a name matching target_type_name. If obj is an ObjectWrapper, the types of the elements of obj._obj are checked instead.
+class _IdentityCache:
+    """A bounded cache keyed on object identity, for memoizing work on unhashable objects such as filter dicts.
+
+    Each entry keeps a reference to its key object, so an `id()` cannot be reused by another object while its entry exists. The cache is cleared when it reaches `maxsize` entries.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._entries: dict[int, tuple[Any, Any]] = {}
+        self._maxsize = maxsize
+
+    def get(self, obj: Any, default: Any = None) -> Any:
+        entry = self._entries.get(id(obj))
+        if entry is not None and entry[0] is obj:
+            return entry[1]
+        return default
+
+    def set(self, obj: Any, value: Any) -> Any:
+        if len(self._entries) >= self._maxsize:
+            self._entries.clear()
+        self._entries[id(obj)] = (obj, value)
+        return value
+
+_SIZE_ENCODER = json.JSONEncoder(default=str)   # reused, since json.dumps builds a new encoder for every call with options
+
+def get_filter_size(filter: dict) -> int:
+    """Returns the size of a filter in bytes, measured as the length of its JSON serialization.
+
+    Args:
+        filter (dict): The filter to measure.
+
+    Returns:
+        int: The length of the filter's JSON serialization.
+    """
+    return len(_SIZE_ENCODER.encode(filter))
+
+_TYPE_NAME_CACHE: dict[tuple[type, frozenset[str]], bool] = {}
+
+def _type_names_match(cls: type, target_type_names: frozenset[str]) -> bool:
+    """Evaluates whether any class in the MRO of cls has a name in target_type_names. Results are cached per (cls, target_type_names) pair."""
+    key = (cls, target_type_names)
+    result = _TYPE_NAME_CACHE.get(key)
+    if result is None:
+        if len(_TYPE_NAME_CACHE) >= 1024:
+            _TYPE_NAME_CACHE.clear()
+        result = not target_type_names.isdisjoint(c.__name__ for c in getmro(cls))
+        _TYPE_NAME_CACHE[key] = result
+    return result
+
+def type_name_matches(obj: Any, target_type_names: str | Iterable[str]) -> bool:
+    """Evaluates whether obj is an instance of a class with a name matching one of target_type_names. If obj is an ObjectWrapper, the types of the elements of obj._obj are checked instead.
 
     Args:
         obj (Any): The object to check the type of.
-        target_type_name (str): The __name__ of a type.
+        target_type_names (str | Iterable[str]): The __name__ of a type, or a collection of them.
 
     Returns:
-        bool: True if obj is an instance of a type matching target_type_name.
+        bool: True if obj is an instance of a type matching one of target_type_names.
     """
+    if isinstance(target_type_names, str):
+        target_type_names = frozenset((target_type_names,))
+    elif not isinstance(target_type_names, frozenset):
+        target_type_names = frozenset(target_type_names)
+
     if isinstance(obj, ObjectWrapper) and isinstance(obj._obj, Iterable):
-        for element in obj._obj:
-            this_valid = False
-            for cls in getmro(type(element)):
-                try:
-                    if cls.__name__ in target_type_names:
-                        this_valid = True
-                except:
-                    pass
-            if not this_valid:
-                return False
-            
-        return True
+        # each distinct element type only needs to be checked once; taken on each call, since the wrapped list may have changed
+        return all(_type_names_match(cls, target_type_names) for cls in set(map(type, obj._obj)))
     else:
         if isinstance(obj, ObjectWrapper):
             obj = obj._obj
-            
-        for cls in getmro(type(obj)):
-            try:
-                if cls.__name__ in target_type_names:
-                    return True
-            except:
-                pass
-
-        return False
+        return _type_names_match(type(obj), target_type_names)
+
+_RULE_KEYS = frozenset(("criterion", "operator", "comparison_value", "parameters", "multi_value_behavior"))
+_CONDITIONAL_EXPRESSION_KEYS = frozenset(("if", "then", "else"))
+_GROUP_EXPRESSION_KEYS = frozenset(("logical_operator", "logical_expressions"))
+_FILTER_KEYS = frozenset(("name", "description", "priority", "object_types", "logical_expression"))
+# instances of these classes always have their type's keys, see parse_filter
+_EXPRESSION_CLASS_TYPES = {
+    Rule: "rule",
+    ConditionalExpression: "conditional_expression",
+    GroupExpression: "group_expression",
+    ObjectFilter: "filter",
+}
 
 def get_logical_expression_type(expression: bool | dict) -> str:
     """Determines the type of a logical expression based on its contents.
@@ -115,18 +228,29 @@ def get_logical_expression_type(expression: bool | dict) -> str:
         return "boolean"
     elif not isinstance(expression, dict):
         raise TypeError("expression is not a bool or dict")
-    key_set = set(expression.keys())
-    if set(("criterion", "operator", "comparison_value", "parameters", "multi_value_behavior")).issubset(key_set):
+    expression_type = _EXPRESSION_CLASS_TYPES.get(type(expression))
+    if expression_type is not None:
+        return expression_type
+
+    key_set = expression.keys()
+    if _RULE_KEYS <= key_set:
         return "rule"
-    if set(("if", "then", "else")).issubset(key_set):
+    if _CONDITIONAL_EXPRESSION_KEYS <= key_set:
         return "conditional_expression"
-    if set(("logical_operator", "logical_expressions")).issubset(key_set):
+    if _GROUP_EXPRESSION_KEYS <= key_set:
         return "group_expression"
-    if set(("name", "description", "priority", "object_types", "logical_expression")).issubset(key_set):
+    if _FILTER_KEYS <= key_set:
         return "filter"
 
     raise ValueError("expression is not a logical expression of any kind (boolean, rule, group expression, conditional expression, or filter)")
 
+# index of each type of logical expression in the dispatch tables
+_KINDS = {"boolean": 0, "rule": 1, "conditional_expression": 2, "group_expression": 3, "filter": 4}
+
+def _kind(expression: bool | dict) -> int:
+    """Returns the index of a logical expression's type in the dispatch tables."""
+    return _KINDS[get_logical_expression_type(expression)]
+
 def is_logical_expression_valid(expression: bool | dict, obj: Any = None) -> bool:
     """Determines whether a logical expression conforms to the format from the documentation.
 
@@ -140,19 +264,12 @@ def is_logical_expression_valid(expression: bool | dict, obj: Any = None) -> boo
     Returns:
         bool: Whether the logical expression is valid.
     """
-    expression_type = get_logical_expression_type(expression)
-    if expression_type == "boolean":
-        return True # True and False are both valid
-    elif expression_type == "rule":
-        return is_rule_valid(expression, obj)
-    elif expression_type == "conditional_expression":
-        return is_conditional_expression_valid(expression, obj)
-    elif expression_type == "group_expression":
-        return is_group_expression_valid(expression, obj)
-    elif expression_type == "filter":
-        return is_filter_valid(expression, obj)
-    else:
-        raise ValueError("expression is not a logical expression of any kind (boolean, rule, group expression, conditional expression, or filter)")
+    return _VALIDATORS[_kind(expression)](expression, obj)
+
+def _is_whitelisted_class_method(obj: Any, criterion: str) -> bool:
+    """Determines whether criterion is a method of obj's class that is whitelisted with @filter_criterion and not shadowed by an attribute of obj itself. `_is_whitelisted` is read on every call, so a method can be un-whitelisted at runtime."""
+    method = getattr(type(obj), criterion, None)
+    return callable(method) and getattr(method, "_is_whitelisted", False) is True and criterion not in getattr(obj, "__dict__", ())
 
 def is_rule_valid(rule: dict, obj: Any = None) -> bool:
     """Determines whether a rule conforms to the format from the documentation. All methods used as criteria must be decorated with @filter_criterion.
@@ -168,7 +285,7 @@ def is_rule_valid(rule: dict, obj: Any = None) -> bool:
         - criterion (str): The variable or method to compare against.
         - operator (str): A string representing the comparison operator to use. Allowed values are: `"<"`, `">"`, `"<="`, `">="`, `"=="`, or `"!="`.
         - comparison_value: The value to compare the value of the criterion with.
-        - parameters (list): Passed into the method if the criterion is a method.
+        - parameters (list | tuple): Passed into the method if the criterion is a method.
     """
     if get_logical_expression_type(rule) != "rule":
         return False
@@ -178,7 +295,7 @@ def is_rule_valid(rule: dict, obj: Any = None) -> bool:
     if not isinstance(rule["operator"], str):
         return False
     # no type check for comparison_value, since it varies
-    if not isinstance(rule["parameters"], list):
+    if not isinstance(rule["parameters"], (list, tuple)):
         return False
     if not isinstance(rule["multi_value_behavior"], str):
         return False
@@ -187,16 +304,19 @@ def is_rule_valid(rule: dict, obj: Any = None) -> bool:
         # value checks
         if rule["operator"].upper() not in VALID_OPERATORS:
             return False
-        try:    # check if method exists
-            method = getattr(obj, rule["criterion"])
-        except:
-            return False
-        # check if method is decorated with @filter_criterion
-        if not isinstance(obj, ObjectWrapper):
-            if callable(method) and not hasattr(method, "_is_whitelisted"):
-                return False
-            if hasattr(method, "_is_whitelisted") and not method._is_whitelisted:
+        # whitelisted methods of the class need no further checks, unless the instance shadows them
+        if isinstance(obj, ObjectWrapper) or not _is_whitelisted_class_method(obj, rule["criterion"]):
+            try:    # check if method exists
+                method = getattr(obj, rule["criterion"])
+            except:
                 return False
+            # check if method is decorated with @filter_criterion
+            if not isinstance(obj, ObjectWrapper):
+                if callable(method) and not hasattr(method, "_is_whitelisted"):
+                    return False
+                if hasattr(method, "_is_whitelisted") and not method._is_whitelisted:
+                    return False
+        if not isinstance(obj, ObjectWrapper):
             if rule["multi_value_behavior"] not in VALID_MULTI_VALUE_BEHAVIORS:
                 return False
     
@@ -219,7 +339,7 @@ def is_conditional_expression_valid(expression: dict, obj: Any = None) -> bool:
     """
     if get_logical_expression_type(expression) != "conditional_expression":
         return False
-    return all([is_logical_expression_valid(exp, obj) for exp in expression.values()])
+    return all(is_logical_expression_valid(expression[key], obj) for key in ("if", "then", "else"))
 
 def is_group_expression_valid(expression: dict, obj: Any = None) -> bool:
     """Determines whether the group expression conforms to the format from the documentation.
@@ -237,7 +357,7 @@ def is_group_expression_valid(expression: dict, obj: Any = None) -> bool:
     """
     if not expression["logical_operator"] in VALID_LOGICAL_OPERATORS:   # must be "and" or "or"
         return False
-    return all([is_logical_expression_valid(exp, obj) for exp in expression["logical_expressions"]])
+    return all(is_logical_expression_valid(exp, obj) for exp in expression["logical_expressions"])
 
 def is_filter_valid(filter: dict, obj: Any = None) -> bool:
     """Determines whether a filter conforms to the format from the documentation.
@@ -247,7 +367,7 @@ def is_filter_valid(filter: dict, obj: Any = None) -> bool:
         obj (Any): The object that will be filtered. All criteria in the rules must be present and whitelisted for its type. Defaults to None.
 
     Raises:
-        ValueError: If the filter dictionary exceeds 100 kilobytes (102,400 bytes).
+        ValueError: If the filter's JSON serialization exceeds 100 kilobytes (102,400 bytes).
 
     Returns:
         bool: Whether the filter is valid.
@@ -260,9 +380,13 @@ def is_filter_valid(filter: dict, obj: Any = None) -> bool:
         - logical_expression (bool | dict): Any logical expression (except filter).
         - multi_value_behavior (str): A string that determines what happens to values returned by an ObjectWrapper.
     """
-    # sanity check on dict size
-    if getsizeof(filter) > 102400:
+    # sanity check on filter size
+    if get_filter_size(filter) > MAX_FILTER_SIZE:
         raise ValueError("Size of filter dictionary must be less than or equal to 100 kilobytes (1024 bytes per kilobyte).")
+    return _is_filter_format_valid(filter, obj)
+
+def _is_filter_format_valid(filter: dict, obj: Any = None) -> bool:
+    """Performs the checks of `is_filter_valid` other than the size check."""
     # filter must contain all of these keys
     if get_logical_expression_type(filter) != "filter":
         return False
@@ -284,17 +408,60 @@ def is_filter_valid(filter: dict, obj: Any = None) -> bool:
     if not is_logical_expression_valid(filter["logical_expression"], obj):
         return False
     # validate obj type
-    if obj is not None and not type_name_matches(obj, filter["object_types"]):
+    if obj is not None and not type_name_matches(obj, _object_types_set(filter)):
         return False
     
     return True
 
+def _object_types_set(filter: dict) -> frozenset[str]:
+    """Returns `filter["object_types"]` as a frozenset for `type_name_matches`. The frozensets are cached by the contents of the list, so nothing is stored in the filter."""
+    return _frozen_object_types(tuple(filter["object_types"]))
+
+@functools.lru_cache(maxsize=1024)
+def _frozen_object_types(object_types: tuple[str, ...]) -> frozenset[str]:
+    return frozenset(object_types)
+
+def _intern_strings(expression: bool | dict) -> None:
+    """Replaces every string value in a logical expression and its nested logical expressions with its interned copy, so equal strings compare by identity. Only used on private copies of filters."""
+    stack = [expression]
+    while stack:
+        container = stack.pop()
+        for key, value in (container.items() if isinstance(container, dict) else enumerate(container)):
+            if type(value) is str:
+                container[key] = sys.intern(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+
+def _is_boolean_valid(expression: bool, obj: Any = None) -> bool:
+    return True # True and False are both valid
+
+# validity check for each type of logical expression, indexed by _kind
+_VALIDATORS: tuple[Callable[[Any, Any], bool], ...] = (
+    _is_boolean_valid,
+    is_rule_valid,
+    is_conditional_expression_valid,
+    is_group_expression_valid,
+    is_filter_valid,
+)
+
+_UNPRINTABLE_CHARACTERS = re.compile(r"[^\x20-\x7e]+")
+
 def sanitize_string(value: str) -> str:
     """Sanitize a string to contain only ASCII characters 32 to 126."""
-    return ''.join(char for char in value if 32 <= ord(char) <= 126)
+    if value.isascii() and value.isprintable():     # common case: nothing to remove, so skip the regex
+        return value
+    return _UNPRINTABLE_CHARACTERS.sub("", value)
+
+def _empty_copy(expression: dict) -> dict:
+    """Returns an empty dict to copy expression into, keeping the class of parsed logical expressions. Their keys are overwritten by the copy."""
+    if type(expression) in _EXPRESSION_CLASS_TYPES:
+        return type(expression)()
+    return {}
 
 def sanitize_filter(filter: dict) -> dict:
-    """Sanitize a dictionary, including nested dictionaries, to ensure all string values contain only ASCII characters 32 to 126.
+    """Sanitize a dictionary, including nested dictionaries and lists, to ensure all string values contain only ASCII characters 32 to 126.
+
+    The filter is copied completely, so the sanitized filter shares no dictionaries or lists with the original.
 
     Args:
         filter (dict): The filter to sanitize.
@@ -308,16 +475,55 @@ def sanitize_filter(filter: dict) -> dict:
     if not isinstance(filter, dict):
         raise TypeError("filter must be a dictionary.")
     
-    sanitized = {}
-    for key, value in filter.items():
-        if isinstance(value, dict):
-            sanitized[key] = sanitize_filter(value)  # Recursively sanitize nested dictionaries
-        elif isinstance(value, str):
-            sanitized[key] = sanitize_string(value)  # Sanitize string values
-        else:
-            sanitized[key] = value  # Keep other data types unchanged
+    sanitized = _empty_copy(filter)
+    stack = [(filter, sanitized)]   # (source, destination) pairs of dictionaries and lists still to copy
+    while stack:
+        source, destination = stack.pop()
+        for key, value in (source.items() if isinstance(source, dict) else enumerate(source)):
+            if isinstance(value, dict):
+                destination[key] = nested = _empty_copy(value)     # sanitize nested dictionaries
+                stack.append((value, nested))
+            elif isinstance(value, list):
+                destination[key] = nested = [None] * len(value)     # sanitize the elements of lists, such as logical_expressions
+                stack.append((value, nested))
+            elif isinstance(value, str):
+                destination[key] = sanitize_string(value)  # Sanitize string values
+            else:
+                destination[key] = value  # Keep other data types unchanged
     return sanitized
 
+def parse_filter(filter: dict) -> ObjectFilter:
+    """Converts a filter, such as one loaded from JSON, into an ObjectFilter whose nested logical expressions are Rule, GroupExpression, and ConditionalExpression instances.
+
+    The type of each logical expression is then known from its class, so it does not have to be determined from its keys. Keys that are not part of the format from the documentation are not copied, and the parameters of each rule are frozen into a tuple, so they can be used as part of a cache key without copying them.
+
+    Args:
+        filter (dict): The filter to convert.
+
+    Raises:
+        ValueError: If filter or any logical expression in it does not match the format of its type.
+
+    Returns:
+        ObjectFilter: The converted filter.
+    """
+    if get_logical_expression_type(filter) != "filter":
+        raise ValueError("filter does not match the format of a filter.")
+    return _parse_logical_expression(filter)
+
+def _parse_logical_expression(expression: bool | dict) -> LogicalExpression:
+    """Converts a logical expression and its children into instances of the logical expression classes. See `parse_filter`."""
+    expression_type = get_logical_expression_type(expression)
+    if expression_type == "boolean":
+        return expression
+    elif expression_type == "rule":
+        return Rule(expression["criterion"], expression["operator"], expression["comparison_value"], tuple(expression["parameters"]), expression["multi_value_behavior"])
+    elif expression_type == "conditional_expression":
+        return ConditionalExpression(*(_parse_logical_expression(expression[key]) for key in ("if", "then", "else")))
+    elif expression_type == "group_expression":
+        return GroupExpression(expression["logical_operator"], [_parse_logical_expression(exp) for exp in expression["logical_expressions"]])
+    else:
+        return ObjectFilter(expression["name"], expression["description"], expression["priority"], expression["object_types"], _parse_logical_expression(expression["logical_expression"]))
+
 def get_value(obj: Any, rule: dict) -> Any:
     """Returns the value of an attribute of `obj`, based on `rule["criterion"]`.
 
@@ -334,7 +540,12 @@ def get_value(obj: Any, rule: dict) -> Any:
     Returns:
         Any: The value of the attribute of `obj`.
     """
-    method = getattr(obj, rule["criterion"])
+    criterion = rule["criterion"]
+    # whitelisted methods of the class need no further checks, unless the instance shadows them
+    if _is_whitelisted_class_method(obj, criterion):
+        return getattr(obj, criterion)(*rule["parameters"])
+
+    method = getattr(obj, criterion)
     
     parameters = rule["parameters"]
     if callable(method):
@@ -347,6 +558,553 @@ def get_value(obj: Any, rule: dict) -> Any:
     else:
         return method
 
+"""
+Compilation Functions
+"""
+
+def compile_filter(filter: dict, obj: Any = None) -> Callable[[Any], bool]:
+    """Compiles a filter into a function that evaluates the filter on an object.
+
+    The filter is walked once, and each logical expression is lowered into a closure that captures its criterion, operator, and comparison value. Calling the returned function avoids re-dispatching on the filter's contents for every object, which makes it suitable for evaluating one filter on many objects. The filter is not sanitized or validated; use `is_filter_valid` before compiling untrusted filters.
+
+    If `obj` is given, whether each criterion is an attribute or a whitelisted method is determined once from `obj`, so the returned function must only be used on objects of the same type as `obj`.
+
+    Args:
+        filter (dict): The filter to compile.
+        obj (Any, optional): A sample of the objects that the filter will be executed on. Defaults to None.
+
+    Raises:
+        ValueError: If filter is not a filter or contains an invalid logical expression.
+        AttributeError: If `obj` is given and a criterion is a method without `@filter_criterion`.
+
+    Returns:
+        Callable[[Any], bool]: A function that accepts an object and returns whether the filter evaluated to True.
+    """
+    if get_logical_expression_type(filter) != "filter":
+        raise ValueError("filter does not match the format of a filter.")
+    return _compile_logical_expression(filter, obj)
+
+def _compile_logical_expression(expression: bool | dict, sample: Any = None, values: dict | None = None) -> Callable[[Any], bool]:
+    """Lowers a logical expression into a closure. See `compile_filter`.
+
+    If `values` is given along with `sample`, rules store the value of each criterion in it and reuse it for other rules with the same criterion and parameters. The caller must clear `values` before evaluating a different object.
+    """
+    expression_type = get_logical_expression_type(expression)
+    if expression_type == "boolean":
+        return lambda obj: expression
+    elif expression_type == "rule":
+        return _compile_rule(expression, sample, values)
+    elif expression_type == "conditional_expression":
+        return _compile_conditional_expression(expression, sample, values)
+    elif expression_type == "group_expression":
+        return _compile_group_expression(expression, sample, values)
+    else:
+        return _compile_nested_filter(expression, sample, values)
+
+def _get_criterion_getter(sample: Any, rule: dict) -> Callable[[Any], Any]:
+    """Returns a function that gets the value of `rule["criterion"]` from objects of the same type as sample, performing the checks of `get_value` once.
+
+    Raises:
+        AttributeError: If the criterion is a method without `@filter_criterion`.
+        ValueError: If the criterion is a method with `@filter_criterion` but `_is_whitelisted` is False.
+    """
+    method = getattr(sample, rule["criterion"])
+    if callable(method):
+        if not hasattr(method, "_is_whitelisted"):
+            raise AttributeError(f"{method}, a criterion in the filter, does not have the @filter_criterion decoractor.")
+        elif not method._is_whitelisted:
+            raise ValueError(f"{method}, a criterion in the filter, has the @filter_criterion decoractor, but _is_whitelisted is set to False.")
+        return operator.methodcaller(rule["criterion"], *rule["parameters"])
+    return operator.attrgetter(rule["criterion"])
+
+def _compile_rule(rule: dict, sample: Any = None, values: dict | None = None) -> Callable[[Any], bool]:
+    """Lowers a rule into a closure that fetches the criterion and compares it with the comparison value."""
+    comparison_value = rule["comparison_value"]
+    comparison = _get_comparison_function(rule["operator"], comparison_value)    # resolved once, not per object
+
+    if sample is not None and not isinstance(sample, ObjectWrapper):
+        get_criterion = _get_criterion_getter(sample, rule)
+        key = (rule["criterion"], tuple(rule["parameters"]))
+        try:
+            hash(key)
+        except TypeError:   # unhashable parameters, so the value cannot be shared
+            values = None
+        if values is None:
+            return lambda obj: comparison(get_criterion(obj), comparison_value)
+
+        def execute_shared_rule(obj: Any) -> bool:
+            try:
+                value = values[key]
+            except KeyError:
+                value = values[key] = get_criterion(obj)
+            return comparison(value, comparison_value)
+        return execute_shared_rule
+
+    def execute_rule(obj: Any) -> bool:
+        if isinstance(obj, ObjectWrapper):
+            return execute_rule_on_object(obj, rule)    # multi_value_behavior only applies to ObjectWrappers
+        return comparison(get_value(obj, rule), comparison_value)
+    return execute_rule
+
+def _compile_conditional_expression(expression: dict, sample: Any = None, values: dict | None = None) -> Callable[[Any], bool]:
+    """Lowers a conditional expression into a closure that only evaluates the branch selected by "if"."""
+    if_branch = _compile_logical_expression(expression["if"], sample, values)
+    then_branch = _compile_logical_expression(expression["then"], sample, values)
+    else_branch = _compile_logical_expression(expression["else"], sample, values)
+    return lambda obj: then_branch(obj) if if_branch(obj) else else_branch(obj)
+
+def _compile_group_expression(expression: dict, sample: Any = None, values: dict | None = None) -> Callable[[Any], bool]:
+    """Lowers a group expression into a closure that evaluates its children cheapest first and short-circuits."""
+    if expression["logical_operator"] not in VALID_LOGICAL_OPERATORS:
+        raise ValueError("Group expression's logical operator must be \"and\" or \"or\".")
+    if sample is not None and not isinstance(sample, ObjectWrapper) and values is None:
+        return _compile_fused_group_expression(expression, sample)
+
+    children = tuple(_compile_logical_expression(exp, sample, values) for exp in _sorted_children(expression))
+    if expression["logical_operator"] == "and":
+        def execute_and(obj: Any) -> bool:
+            for child in children:
+                if not child(obj):
+                    return False
+            return True
+        return execute_and
+    elif expression["logical_operator"] == "or":
+        def execute_or(obj: Any) -> bool:
+            for child in children:
+                if child(obj):
+                    return True
+            return False
+        return execute_or
+    else:
+        raise ValueError("Group expression's logical operator must be \"and\" or \"or\".")
+
+# comparison functions that can be written as a Python operator in generated code
+_INLINE_OPERATORS = {
+    operator.lt: "<",
+    operator.le: "<=",
+    operator.eq: "==",
+    operator.ne: "!=",
+    operator.ge: ">=",
+    operator.gt: ">",
+}
+
+def _compile_fused_group_expression(expression: dict, sample: Any) -> Callable[[Any], bool]:
+    """Lowers a group expression into one generated function that evaluates all of its children in a single `and`/`or` chain.
+
+    Rules are inlined into the chain, so a group of rules costs one Python call instead of one per rule. Plain attributes are read with attribute syntax, exact comparisons use Python's operators, and a criterion used by several rules is only fetched once. Other children are compiled separately and called from the chain.
+    """
+    namespace = {}
+    terms = []
+    fetched = {}    # (criterion, parameters) -> name of the local holding its value
+    for i, exp in enumerate(_sorted_children(expression)):
+        if get_logical_expression_type(exp) != "rule":
+            namespace[f"child_{i}"] = _compile_logical_expression(exp, sample)
+            terms.append(f"child_{i}(obj)")
+            continue
+
+        comparison_value = exp["comparison_value"]
+        comparison = _get_comparison_function(exp["operator"], comparison_value)
+        get_criterion = _get_criterion_getter(sample, exp)
+        key = (exp["criterion"], tuple(exp["parameters"]))
+        try:
+            value = fetched.get(key)
+        except TypeError:   # unhashable parameters, so the value cannot be shared
+            key, value = None, None
+        if value is None:
+            criterion = exp["criterion"]
+            if isinstance(get_criterion, operator.attrgetter) and criterion.isidentifier() and not keyword.iskeyword(criterion):
+                fetch = f"obj.{criterion}"
+            else:
+                namespace[f"get_{i}"] = get_criterion
+                fetch = f"get_{i}(obj)"
+            value = f"(value_{i} := {fetch})"
+            if key is not None:
+                fetched[key] = f"value_{i}"
+
+        namespace[f"comparison_value_{i}"] = comparison_value
+        if comparison in _INLINE_OPERATORS:
+            terms.append(f"{value} {_INLINE_OPERATORS[comparison]} comparison_value_{i}")
+        else:
+            namespace[f"comparison_{i}"] = comparison
+            terms.append(f"comparison_{i}({value}, comparison_value_{i})")
+
+    if not terms:   # an empty "and" is True and an empty "or" is False, as with all() and any()
+        return lambda obj: expression["logical_operator"] == "and"
+    chain = f" {expression['logical_operator']} ".join(f"({term})" for term in terms)
+    exec(f"def execute_group_expression(obj):\n    return True if {chain} else False", namespace)
+    return namespace["execute_group_expression"]
+
+def _compile_nested_filter(filter: dict, sample: Any = None, values: dict | None = None) -> Callable[[Any], bool]:
+    """Lowers a filter into a closure that checks the object's type before evaluating its logical expression."""
+    object_types = _object_types_set(filter)
+    logical_expression = _compile_logical_expression(filter["logical_expression"], sample, values)
+
+    def execute_filter(obj: Any) -> bool:
+        if not type_name_matches(obj, object_types):
+            raise ValueError("Filter is not valid.")
+        return logical_expression(obj)
+    return execute_filter
+
+def _isclose_array(values: np.ndarray, comparison_value: int | float) -> np.ndarray[bool]:
+    """Vectorized equivalent of `math.isclose(value, comparison_value, abs_tol=ABS_TOL)` for each element of values."""
+    if not isfinite(comparison_value):
+        return values == comparison_value   # like math.isclose, infinities are only close to themselves
+    tolerance = np.maximum(1e-09 * np.maximum(np.abs(values), abs(comparison_value)), _ABS_TOL_F)
+    with np.errstate(invalid="ignore"):
+        return (values == comparison_value) | (np.isfinite(values) & (np.abs(values - comparison_value) <= tolerance))
+
+# operator codes used by CompiledFilter and the numba kernel
+_OPERATORS = ("<", "<=", "==", "!=", ">=", ">")
+_OP_CODES: dict[str, int] = {op: code for code, op in enumerate(_OPERATORS)}
+
+# vectorized comparison functions by operator code, used when neither the values nor comparison_value are floats
+_VECTOR_EXACT_OPS: tuple[Callable[[np.ndarray, Any], np.ndarray[bool]], ...] = (
+    np.less,
+    np.less_equal,
+    np.equal,
+    np.not_equal,
+    np.greater_equal,
+    np.greater,
+)
+# vectorized comparison functions by operator code with a tolerance of ABS_TOL, used when the values or comparison_value are floats
+_VECTOR_INEXACT_OPS: tuple[Callable[[np.ndarray, Any], np.ndarray[bool]], ...] = (
+    np.less,
+    lambda values, comparison_value: (values < comparison_value) | _isclose_array(values, comparison_value),
+    _isclose_array,
+    lambda values, comparison_value: ~_isclose_array(values, comparison_value),
+    lambda values, comparison_value: (values > comparison_value) | _isclose_array(values, comparison_value),
+    np.greater,
+)
+
+_MAX_EXACT_FLOAT_INT = 2**53   # integers up to this magnitude are exactly representable as float64
+
+def _numeric_column(values: list) -> np.ndarray | None:
+    """Converts criterion values into a float64 or int64 column. Returns None if the values are not all floats or all ints that fit in int64.
+
+    Columns mixing ints and floats are not converted, since NumPy would upcast the ints and compare them with the tolerance of floats.
+    """
+    value_types = set(map(type, values))
+    if value_types <= {float}:
+        return np.array(values, dtype=np.float64)
+    if value_types == {int}:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return None
+    return None
+
+def _is_exact_column_comparison(column: np.ndarray, comparison_value: Any) -> bool:
+    """Determines whether NumPy compares each element of a numeric column with comparison_value the way Python compares the element's value.
+
+    NumPy converts ints to float64 to compare them with floats, which is only exact up to 2**53, and cannot compare int64 columns with ints outside its range.
+    """
+    if type(comparison_value) is float:
+        return column.dtype.kind == "f" or len(column) == 0 or (column.min() >= -_MAX_EXACT_FLOAT_INT and column.max() <= _MAX_EXACT_FLOAT_INT)
+    if type(comparison_value) in (int, bool):
+        if column.dtype.kind == "f":
+            return abs(comparison_value) <= _MAX_EXACT_FLOAT_INT
+        return -2**63 <= comparison_value < 2**63
+    return False
+
+def _is_method_criterion(sample: Any, rule: dict) -> bool:
+    """Determines whether `rule["criterion"]` is a method of sample."""
+    try:
+        return callable(getattr(sample, rule["criterion"]))
+    except Exception:
+        return False
+
+def _is_vectorizable_rule(rule: dict, sample: Any) -> bool:
+    """Determines whether a rule compares a plain attribute of sample with an int or float."""
+    if isinstance(sample, ObjectWrapper) or type(rule["comparison_value"]) not in (int, float):
+        return False
+    if rule["operator"] not in _OP_CODES:
+        return False
+    try:
+        getattr(sample, rule["criterion"])
+    except Exception:
+        return False
+    return not _is_method_criterion(sample, rule)
+
+def _get_vectorized_twin(sample: Any, rule: dict) -> Callable[..., np.ndarray] | None:
+    """Returns the vectorized twin of a method criterion of sample, if the rule compares it with an int or float."""
+    if sample is None or isinstance(sample, ObjectWrapper) or type(rule["comparison_value"]) not in (int, float):
+        return None
+    if rule["operator"] not in _OP_CODES or not _is_method_criterion(sample, rule):
+        return None
+    return _get_method_dispatch(frozenset((type(sample), )), rule["criterion"])[1]
+
+@dataclass
+class CompiledFilter:
+    """A logical expression lowered into a structure of arrays, for evaluating it on arrays of objects.
+
+    Rules are stored column-wise. Rule `i` gets `criteria[i]` from each object, calling it with `parameters[i]` if `is_method[i]`, and compares the value with `comparison_values[i]` using the operator encoded in `op_codes[i]`. `executors[i]` evaluates rule `i` on a single object. Rules marked in `vectorizable` compare a plain attribute with an int or float and can be evaluated with NumPy. `twins[i]` is the vectorized twin of a method criterion (see `filter_criterion`), or None.
+
+    `tree` holds the logical structure as nested tuples whose rule leaves refer to rules by index:
+
+    - `("boolean", value)`
+    - `("rule", index)`
+    - `("and", children)` or `("or", children)`, with children in evaluation order
+    - `("conditional", if_node, then_node, else_node)`
+    - `("filter", object_types, node)`
+    """
+    criteria: list[str]
+    parameters: list[tuple]
+    comparison_values: list[Any]
+    is_method: np.ndarray
+    op_codes: np.ndarray
+    vectorizable: np.ndarray
+    twins: list[Callable[..., np.ndarray] | None]
+    executors: list[Callable[[Any], bool]]
+    tree: tuple
+
+    @classmethod
+    def from_logical_expression(cls, expression: bool | dict, obj: Any) -> "CompiledFilter":
+        """Lowers a logical expression into a CompiledFilter for objects of the same type as obj.
+
+        Args:
+            expression (bool | dict): The logical expression to lower, usually `filter["logical_expression"]`.
+            obj (Any): A sample of the objects that the expression will be executed on, or None if they are not all of the same type.
+
+        Raises:
+            ValueError: If expression contains an invalid logical expression or operator.
+
+        Returns:
+            CompiledFilter: The lowered logical expression.
+        """
+        rules = []
+        tree = _lower_logical_expression(expression, rules)
+        executors = [_compile_rule(rule, obj) for rule in rules]   # also rejects invalid operators
+        return cls(
+            criteria=[rule["criterion"] for rule in rules],
+            parameters=[tuple(rule["parameters"]) for rule in rules],
+            comparison_values=[rule["comparison_value"] for rule in rules],
+            is_method=np.array([_is_method_criterion(obj, rule) for rule in rules], dtype=bool),
+            op_codes=np.array([_OP_CODES[rule["operator"]] for rule in rules], dtype=np.uint8),
+            vectorizable=np.array([_is_vectorizable_rule(rule, obj) for rule in rules], dtype=bool),
+            twins=[_get_vectorized_twin(obj, rule) for rule in rules],
+            executors=executors,
+            tree=tree,
+        )
+
+def _lower_logical_expression(expression: bool | dict, rules: list[dict]) -> tuple:
+    """Converts a logical expression into a `CompiledFilter.tree` node, appending its rules to rules."""
+    expression_type = get_logical_expression_type(expression)
+    if expression_type == "boolean":
+        return ("boolean", expression)
+    elif expression_type == "rule":
+        rules.append(expression)
+        return ("rule", len(rules) - 1)
+    elif expression_type == "conditional_expression":
+        return ("conditional", _lower_logical_expression(expression["if"], rules), _lower_logical_expression(expression["then"], rules), _lower_logical_expression(expression["else"], rules))
+    elif expression_type == "group_expression":
+        if expression["logical_operator"] not in VALID_LOGICAL_OPERATORS:
+            raise ValueError("Group expression's logical operator must be \"and\" or \"or\".")
+        return (expression["logical_operator"], tuple(_lower_logical_expression(exp, rules) for exp in _sorted_children(expression)))
+    else:
+        return ("filter", _object_types_set(expression), _lower_logical_expression(expression["logical_expression"], rules))
+
+_VectorizedExpression = Callable[[np.ndarray], np.ndarray]
+
+def _as_object_array(obj_array: Iterable[Any]) -> np.ndarray:
+    """Returns obj_array as a one-dimensional NumPy array of objects, without copying if it already is one."""
+    if isinstance(obj_array, np.ndarray) and obj_array.dtype == object and obj_array.ndim == 1:
+        return obj_array
+    return np.fromiter(obj_array, dtype=object, count=len(obj_array))
+
+def _compile_vectorized(compiled_filter: CompiledFilter, node: tuple | None = None) -> _VectorizedExpression:
+    """Lowers a CompiledFilter (or one node of its tree) into a function that evaluates it on a whole array of objects at once.
+
+    The returned function accepts a one-dimensional object array and returns a boolean array of the same length. Vectorizable rules are evaluated with NumPy on a column of values gathered from the array. Every other rule is evaluated per object by its executor. Group and conditional expressions only evaluate their children on the elements whose result is still undecided, so they short-circuit exactly like the scalar functions.
+
+    Args:
+        compiled_filter (CompiledFilter): The lowered logical expression.
+        node (tuple | None, optional): The node of `compiled_filter.tree` to compile. Defaults to the root.
+
+    Returns:
+        _VectorizedExpression: A function that evaluates the logical expression on an array of objects.
+    """
+    if node is None:
+        node = compiled_filter.tree
+    kind = node[0]
+    if kind == "boolean":
+        value = node[1]
+        return lambda objs: np.full(len(objs), value, dtype=bool)
+    elif kind == "rule":
+        return _compile_vectorized_rule(compiled_filter, node[1])
+    elif kind == "conditional":
+        return _compile_vectorized_conditional_expression(compiled_filter, node)
+    elif kind == "filter":
+        return _compile_vectorized_nested_filter(compiled_filter, node)
+    else:
+        return _compile_vectorized_group_expression(compiled_filter, node)
+
+def _compile_vectorized_rule(compiled_filter: CompiledFilter, index: int) -> _VectorizedExpression:
+    """Lowers a rule into a NumPy comparison over a column of attribute values, or a per-object loop if that is not possible."""
+    execute_rule = compiled_filter.executors[index]
+
+    def execute_rule_per_object(objs: np.ndarray) -> np.ndarray[bool]:
+        return np.fromiter((execute_rule(obj) for obj in objs), dtype=bool, count=len(objs))
+
+    twin = compiled_filter.twins[index]
+    if not compiled_filter.vectorizable[index] and twin is None:
+        return execute_rule_per_object
+
+    criterion = compiled_filter.criteria[index]
+    parameters = compiled_filter.parameters[index]
+    get_criterion = operator.attrgetter(criterion)
+    comparison_value = compiled_filter.comparison_values[index]
+    exact_comparison = _VECTOR_EXACT_OPS[compiled_filter.op_codes[index]]
+    inexact_comparison = _VECTOR_INEXACT_OPS[compiled_filter.op_codes[index]]
+
+    def get_values(objs: np.ndarray) -> np.ndarray | None:
+        if twin is None:
+            return _numeric_column([get_criterion(obj) for obj in objs])
+        # subclasses may override the method without the twin, so every type in objs must share it
+        if len(objs) == 0 or _get_method_dispatch(frozenset(map(type, objs)), criterion)[1] is not twin:
+            return None
+        values = _call_twin(twin, objs, parameters, {})
+        # twins compute on object arrays of Python ints, which are only compared in NumPy if they fit int64
+        return _numeric_column(values.tolist()) if values.dtype == object else values
+
+    def execute_rule_vectorized(objs: np.ndarray) -> np.ndarray[bool]:
+        values = get_values(objs)
+        # not a numeric column, e.g. bools, mixed ints and floats, or very large ints
+        if values is None or values.dtype.kind not in "iuf" or not _is_exact_column_comparison(values, comparison_value):
+            return execute_rule_per_object(objs)
+        if values.dtype.kind in "iu" and isinstance(comparison_value, int):
+            return exact_comparison(values, comparison_value)
+        return inexact_comparison(values, comparison_value)
+    return execute_rule_vectorized
+
+def _compile_vectorized_conditional_expression(compiled_filter: CompiledFilter, node: tuple) -> _VectorizedExpression:
+    """Lowers a conditional expression into a function that evaluates each branch only on the elements that select it."""
+    if_branch, then_branch, else_branch = (_compile_vectorized(compiled_filter, branch) for branch in node[1:])
+
+    def execute_conditional_expression(objs: np.ndarray) -> np.ndarray[bool]:
+        condition = if_branch(objs)
+        result = np.empty(len(objs), dtype=bool)
+        if condition.any():
+            result[condition] = then_branch(objs[condition])
+        if not condition.all():
+            result[~condition] = else_branch(objs[~condition])
+        return result
+    return execute_conditional_expression
+
+NUMBA_MIN_ARRAY_SIZE = 1024     # smaller arrays are not worth the kernel's thread startup
+
+@functools.cache
+def _get_numba_group_kernel() -> Callable | None:
+    """Compiles the kernel used by `_compile_numba_group` on first use. Returns None if numba is not installed."""
+    numba = _import_numba()
+    if numba is None:
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def numba_group_kernel(columns, column_indices, comparison_values, op_codes, inexact, is_and, abs_tol, out):
+        """Evaluates a group expression of numeric rules on every element in one pass. Rule r compares row column_indices[r] of columns."""
+        for i in numba.prange(columns.shape[1]):
+            result = is_and
+            for r in range(column_indices.shape[0]):
+                value = columns[column_indices[r], i]
+                comparison_value = comparison_values[r]
+                op_code = op_codes[r]
+                close = False
+                if inexact[r] and op_code >= 1 and op_code <= 4:
+                    if value == comparison_value:
+                        close = True
+                    elif np.isfinite(value) and np.isfinite(comparison_value):
+                        close = abs(value - comparison_value) <= max(1e-09 * max(abs(value), abs(comparison_value)), abs_tol)
+                if op_code == 0:
+                    passed = value < comparison_value
+                elif op_code == 1:
+                    passed = value <= comparison_value or close
+                elif op_code == 2:
+                    passed = value == comparison_value or close
+                elif op_code == 3:
+                    passed = value != comparison_value and not close
+                elif op_code == 4:
+                    passed = value >= comparison_value or close
+                else:
+                    passed = value > comparison_value
+                if passed != is_and:    # a False child decides "and", a True child decides "or"
+                    result = passed
+                    break
+            out[i] = result
+    return numba_group_kernel
+
+def _compile_numba_group(compiled_filter: CompiledFilter, indices: list[int], is_and: bool) -> Callable[[np.ndarray], np.ndarray | None]:
+    """Lowers a group expression whose children are all vectorizable rules into a single numba kernel call.
+
+    The returned function gathers each distinct criterion's column once, then evaluates the whole group in one fused pass instead of one NumPy operation per rule. It returns None if a column is not all floats or all ints that float64 represents exactly, in which case the caller must fall back to NumPy. No kernel is compiled, and None is returned instead of a function, if numba is not installed or a comparison value is not exactly representable as float64.
+    """
+    rule_comparison_values = [compiled_filter.comparison_values[i] for i in indices]
+    numba_group_kernel = _get_numba_group_kernel()
+    if numba_group_kernel is None or not all(type(value) is float or (type(value) in (int, bool) and abs(value) <= _MAX_EXACT_FLOAT_INT) for value in rule_comparison_values):
+        return None
+    criteria = list(dict.fromkeys(compiled_filter.criteria[i] for i in indices))
+    getters = [operator.attrgetter(criterion) for criterion in criteria]
+    column_indices = np.array([criteria.index(compiled_filter.criteria[i]) for i in indices], dtype=np.intp)
+    comparison_values = np.array(rule_comparison_values, dtype=np.float64)
+    op_codes = compiled_filter.op_codes[indices]
+    int_comparison_values = np.array([type(value) is not float for value in rule_comparison_values], dtype=bool)
+    abs_tol = _ABS_TOL_F
+
+    def execute_group_expression(objs: np.ndarray) -> np.ndarray[bool] | None:
+        columns = np.empty((len(criteria), len(objs)), dtype=np.float64)
+        float_columns = np.zeros(len(criteria), dtype=bool)
+        for c, get_criterion in enumerate(getters):
+            try:
+                values = _numeric_column([get_criterion(obj) for obj in objs])
+            except Exception:
+                return None
+            if values is None:  # mixed ints and floats, which the kernel would compare with the tolerance of floats
+                return None
+            if values.dtype.kind == "f":
+                float_columns[c] = True
+            elif len(values) and (values.min() < -_MAX_EXACT_FLOAT_INT or values.max() > _MAX_EXACT_FLOAT_INT):   # would lose precision as float64
+                return None
+            columns[c] = values
+        inexact = float_columns[column_indices] | ~int_comparison_values
+        out = np.empty(len(objs), dtype=bool)
+        numba_group_kernel(columns, column_indices, comparison_values, op_codes, inexact, is_and, abs_tol, out)
+        return out
+    return execute_group_expression
+
+def _compile_vectorized_group_expression(compiled_filter: CompiledFilter, node: tuple) -> _VectorizedExpression:
+    """Lowers a group expression into a function that evaluates each child only on the elements whose result is still undecided."""
+    is_and = node[0] == "and"
+    children = tuple(_compile_vectorized(compiled_filter, child) for child in node[1])
+
+    fused_group = None
+    if node[1] and all(child[0] == "rule" and compiled_filter.vectorizable[child[1]] for child in node[1]):
+        fused_group = _compile_numba_group(compiled_filter, [child[1] for child in node[1]], is_and)
+
+    def execute_group_expression(objs: np.ndarray) -> np.ndarray[bool]:
+        if fused_group is not None and len(objs) >= NUMBA_MIN_ARRAY_SIZE:
+            result = fused_group(objs)
+            if result is not None:
+                return result
+        result = np.full(len(objs), is_and, dtype=bool)
+        for child in children:
+            # "and" only needs to evaluate elements that are still True, "or" only those still False
+            undecided = np.flatnonzero(result if is_and else ~result)
+            if len(undecided) == 0:
+                break
+            result[undecided] = child(objs[undecided])
+        return result
+    return execute_group_expression
+
+def _compile_vectorized_nested_filter(compiled_filter: CompiledFilter, node: tuple) -> _VectorizedExpression:
+    """Lowers a filter into a function that checks the types in the array before evaluating its logical expression."""
+    object_types = node[1]
+    logical_expression = _compile_vectorized(compiled_filter, node[2])
+
+    def execute_filter(objs: np.ndarray) -> np.ndarray[bool]:
+        if not _array_types_match(objs, object_types):
+            raise ValueError("Filter is not valid.")
+        return logical_expression(objs)
+    return execute_filter
+
 """
 Execution Functions
 """
@@ -364,43 +1122,95 @@ def execute_logical_expression_on_object(obj: Any, expression: bool | dict) -> b
     Returns:
         bool: The evaluation of the logical expression.
     """
-    expression_type = get_logical_expression_type(expression)
-    if expression_type == "boolean":
-        return expression
-    if expression_type == "rule":
-        return execute_rule_on_object(obj, expression)
-    elif expression_type == "conditional_expression":
-        return execute_conditional_expression_on_object(obj, expression)
-    elif expression_type == "group_expression":
-        return execute_group_expression_on_object(obj, expression)
-    elif expression_type == "filter":
-        return execute_filter_on_object(obj, expression)
+    executor = _EXECUTORS.get(type(expression))
+    if executor is None:    # plain dicts
+        executor = _EXECUTORS_BY_KIND[_kind(expression)]
+    return executor(obj, expression)
+
+def _is_inexact(obj_value: Any, comparison_value: Any) -> bool:
+    return isinstance(obj_value, (float, Decimal)) or isinstance(comparison_value, (float, Decimal))
+
+def _le_fuzzy(obj_value: Any, comparison_value: Any) -> bool:
+    if _is_inexact(obj_value, comparison_value):
+        return obj_value < comparison_value or isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+    return obj_value <= comparison_value
+
+def _eq_fuzzy(obj_value: Any, comparison_value: Any) -> bool:
+    if _is_inexact(obj_value, comparison_value):
+        return isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+    return obj_value == comparison_value
+
+def _ne_fuzzy(obj_value: Any, comparison_value: Any) -> bool:
+    if _is_inexact(obj_value, comparison_value):
+        return not isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+    return obj_value != comparison_value
+
+def _ge_fuzzy(obj_value: Any, comparison_value: Any) -> bool:
+    if _is_inexact(obj_value, comparison_value):
+        return obj_value > comparison_value or isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+    return obj_value >= comparison_value
+
+def _le_inexact(obj_value: Any, comparison_value: Any) -> bool:
+    return obj_value < comparison_value or isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+
+def _eq_inexact(obj_value: Any, comparison_value: Any) -> bool:
+    return isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+
+def _ne_inexact(obj_value: Any, comparison_value: Any) -> bool:
+    return not isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+
+def _ge_inexact(obj_value: Any, comparison_value: Any) -> bool:
+    return obj_value > comparison_value or isclose(obj_value, comparison_value, abs_tol=_ABS_TOL_F)
+
+# comparison function for each operator; floats and Decimals are compared with a tolerance of ABS_TOL
+_OP_TABLE: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": _le_fuzzy,
+    "==": _eq_fuzzy,
+    "!=": _ne_fuzzy,
+    ">=": _ge_fuzzy,
+    ">": operator.gt,
+}
+# used when comparison_value is a float or Decimal, so the tolerance always applies
+_INEXACT_OP_TABLE: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": _le_inexact,
+    "==": _eq_inexact,
+    "!=": _ne_inexact,
+    ">=": _ge_inexact,
+    ">": operator.gt,
+}
+# used when comparison_value is not a number, so the tolerance never applies
+_EXACT_OP_TABLE: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
+
+def _get_comparison_function(operator: str, comparison_value: Any) -> Callable[[Any, Any], bool]:
+    """Returns the comparison function for an operator, specialized for the type of comparison_value.
+
+    Only integer comparison values need the type of the object's value to be checked at comparison time, since the object's value may be a float.
+
+    Raises:
+        ValueError: If operator is invalid.
+    """
+    if isinstance(comparison_value, (float, Decimal)):
+        table = _INEXACT_OP_TABLE
+    elif isinstance(comparison_value, int):
+        table = _OP_TABLE
     else:
-        raise ValueError("expression is not a logical expression of any kind (boolean, rule, group expression, conditional expression, or filter)")
+        table = _EXACT_OP_TABLE
+    try:
+        return table[operator]
+    except (KeyError, TypeError):
+        raise ValueError("operator is invalid.") from None
 
 def criterion_comparison(obj_value: int | float | str | bool, operator: str, comparison_value: int | float | str | bool) -> bool:
-    if operator == "<":
-        return obj_value < comparison_value
-    elif operator == "<=":
-        if isinstance(obj_value, (float, Decimal)) or isinstance(comparison_value, (float, Decimal)):
-            return obj_value < comparison_value or isclose(obj_value, comparison_value, abs_tol=ABS_TOL)
-        return obj_value <= comparison_value
-    elif operator == "==":
-        if isinstance(obj_value, (float, Decimal)) or isinstance(comparison_value, (float, Decimal)):
-            return isclose(obj_value, comparison_value, abs_tol=ABS_TOL)
-        return obj_value == comparison_value
-    elif operator == "!=":
-        if isinstance(obj_value, (float, Decimal)) or isinstance(comparison_value, (float, Decimal)):
-            return not isclose(obj_value, comparison_value, abs_tol=ABS_TOL)
-        return obj_value != comparison_value
-    elif operator == ">=":
-        if isinstance(obj_value, (float, Decimal)) or isinstance(comparison_value, (float, Decimal)):
-            return obj_value > comparison_value or isclose(obj_value, comparison_value, abs_tol=ABS_TOL)
-        return obj_value >= comparison_value
-    elif operator == ">":
-        return obj_value > comparison_value
-    else:
-        raise ValueError("operator is invalid.")
+    return _get_comparison_function(operator, comparison_value)(obj_value, comparison_value)
 
 def execute_rule_on_object(obj: Any, rule: dict) -> bool:
     """Returns the result of the comparison operation defined by the rule.
@@ -419,8 +1229,8 @@ def execute_rule_on_object(obj: Any, rule: dict) -> bool:
         raise ValueError("rule does not match the format of a rule.")
     
     obj_value = get_value(obj, rule)
-    operator = rule["operator"]
     comparison_value = rule["comparison_value"]
+    comparison = _get_comparison_function(rule["operator"], comparison_value)
 
     if isinstance(obj, ObjectWrapper) and isinstance(obj._obj, Iterable):
         multi_value_behavior = rule["multi_value_behavior"]
@@ -434,13 +1244,13 @@ def execute_rule_on_object(obj: Any, rule: dict) -> bool:
             else:
                 raise TypeError(f"obj.{rule["criterion"]} on ObjectWrapper with multi_value_behavior \"add\" did not return a list of numbers or strings.")
         elif multi_value_behavior == "each_meets_criterion":
-            return all([criterion_comparison(get_value(x, rule), operator, comparison_value) for x in obj._obj])
+            return all(comparison(value, comparison_value) for value in obj_value)
         elif multi_value_behavior == "each_equal_in_object":    # ignores comparison_value in favor of checking internal equality of elements
-            return all([criterion_comparison(obj_value[0], "==", val) for val in obj_value[1:]])    # avoids float comparison imprecision
+            return all(_eq_fuzzy(obj_value[0], val) for val in obj_value[1:])    # avoids float comparison imprecision
         else:
             raise ValueError("multi_value_behavior has an invalid value.")
 
-    return criterion_comparison(obj_value, operator, comparison_value)
+    return comparison(obj_value, comparison_value)
     
 def execute_conditional_expression_on_object(obj: Any, expression: dict) -> bool:
     """Executes a conditional expression on an object.
@@ -462,9 +1272,53 @@ def execute_conditional_expression_on_object(obj: Any, expression: dict) -> bool
     else:
         return execute_logical_expression_on_object(obj, expression["else"])
     
+def _cost(expression: bool | dict, costs: dict[int, float] | None = None) -> float:
+    """Estimates the relative cost of executing a logical expression.
+
+    Booleans cost 0, rules cost 1, and rules with parameters, which always call a method, cost METHOD_RULE_COST. A group expression costs the sum of its children, a conditional expression costs its "if" branch plus the more expensive of its other branches, and a filter costs its logical expression.
+
+    Args:
+        expression (bool | dict): The logical expression to estimate the cost of.
+        costs (dict[int, float] | None, optional): The cost of each dict in the expression by `id()`, filled in as they are estimated, so that sorting the children of nested group expressions does not estimate them again. Only valid while the expression is unchanged. Defaults to None.
+
+    Returns:
+        float: The estimated cost of executing the logical expression.
+    """
+    expression_type = get_logical_expression_type(expression)
+    if expression_type == "boolean":
+        return 0
+    if costs is not None and id(expression) in costs:
+        return costs[id(expression)]
+    if expression_type == "rule":
+        cost = METHOD_RULE_COST if expression["parameters"] else 1
+    elif expression_type == "conditional_expression":
+        cost = _cost(expression["if"], costs) + max(_cost(expression["then"], costs), _cost(expression["else"], costs))
+    elif expression_type == "group_expression":
+        cost = sum(_cost(exp, costs) for exp in expression["logical_expressions"])
+    else:
+        cost = _cost(expression["logical_expression"], costs)
+    if costs is not None:
+        costs[id(expression)] = cost
+    return cost
+
+def _sorted_children(expression: dict, costs: dict[int, float] | None = None) -> list[bool | dict]:
+    """Returns the children of a group expression in evaluation order, cheapest first. The order is computed from the current children on every call and is not stored in the expression. See `_cost` for costs."""
+    costs = {} if costs is None else costs
+    if expression["logical_operator"] == "or":
+        return sorted(expression["logical_expressions"], key=lambda exp: (_cost(exp, costs), -_selectivity(exp)))
+    return sorted(expression["logical_expressions"], key=lambda exp: (_cost(exp, costs), _selectivity(exp)))
+
+def _selectivity(expression: bool | dict) -> float:
+    """Returns the estimated fraction of objects for which `expression` evaluates to True. Among expressions of equal cost, "and" groups evaluate likely False expressions first, and "or" groups likely True ones."""
+    if isinstance(expression, bool):
+        return 1.0 if expression else 0.0
+    return DEFAULT_SELECTIVITY
+
 def execute_group_expression_on_object(obj: Any, expression: dict) -> bool:
     """Executes a group expression on an object.
 
+    Children are evaluated in order of estimated cost (see `_cost`), not in list order, and evaluation stops at the first child that decides the result. If several children would raise an exception, such as a criterion without `@filter_criterion`, the exception that surfaces is from the first of them in evaluation order.
+
     Args:
         obj (Any): The object that the group expression will be executed with. All criteria in the rules must be present and whitelisted for its type.
         expression (dict): The group expression to execute.
@@ -478,13 +1332,32 @@ def execute_group_expression_on_object(obj: Any, expression: dict) -> bool:
     """
     if get_logical_expression_type(expression) != "group_expression":
         raise ValueError("expression does not match the format of a group expression.")
+    return _execute_group_expression(obj, expression, {})   # the costs are estimated once for the whole expression
+
+def _execute_group_expression(obj: Any, expression: dict, costs: dict[int, float]) -> bool:
+    """Executes a group expression whose type is known, sharing costs (see `_cost`) with its nested group expressions."""
     if expression["logical_operator"] == "and":
-        return all([execute_logical_expression_on_object(obj, exp) for exp in expression["logical_expressions"]])
+        for exp in _sorted_children(expression, costs):
+            if not _execute_child(obj, exp, costs):
+                return False
+        return True
     elif expression["logical_operator"] == "or":
-        return any([execute_logical_expression_on_object(obj, exp) for exp in expression["logical_expressions"]])
+        for exp in _sorted_children(expression, costs):
+            if _execute_child(obj, exp, costs):
+                return True
+        return False
     else:
         raise ValueError("Group expression's logical operator must be \"and\" or \"or\".")
 
+def _execute_child(obj: Any, expression: bool | dict, costs: dict[int, float]) -> bool:
+    """Executes a child of a group expression, passing costs on to group expressions nested in it directly or through conditional expressions."""
+    expression_type = get_logical_expression_type(expression)
+    if expression_type == "group_expression":
+        return _execute_group_expression(obj, expression, costs)
+    elif expression_type == "conditional_expression":
+        return _execute_child(obj, expression["then"] if _execute_child(obj, expression["if"], costs) else expression["else"], costs)
+    return execute_logical_expression_on_object(obj, expression)
+
 def execute_filter_on_object(obj, filter: dict, sanitize: bool = True) -> bool:
     """Evaluates a filter on an object. Returns True if all logical expressions succeed and False if any of them fail.
 
@@ -500,11 +1373,129 @@ def execute_filter_on_object(obj, filter: dict, sanitize: bool = True) -> bool:
         bool: Whether all the logical expressions in the filter evaluated to True.
     """
     if sanitize:
-        filter = sanitize_filter(filter)
-    if not is_filter_valid(filter, obj):
+        filter, expression_key = _get_sanitized_filter(filter)
+        valid = _is_filter_format_valid(filter, obj)    # the size was checked when the filter was sanitized
+    else:
+        expression_key = None
+        valid = is_filter_valid(filter, obj)
+    if not valid:
         raise ValueError("Filter is not valid.")
     
-    return execute_logical_expression_on_object(obj, filter["logical_expression"])
+    return _get_compiled_expression(filter, obj, expression_key)(obj)
+
+def _execute_boolean(obj: Any, expression: bool) -> bool:
+    return expression
+
+# executor for each type of logical expression, indexed by _kind
+_EXECUTORS_BY_KIND: tuple[Callable[[Any, Any], bool], ...] = (
+    _execute_boolean,
+    execute_rule_on_object,
+    execute_conditional_expression_on_object,
+    execute_group_expression_on_object,
+    execute_filter_on_object,
+)
+# executor for each class of logical expression, so their type does not have to be determined from their keys
+_EXECUTORS: dict[type, Callable[[Any, Any], bool]] = {
+    bool: _execute_boolean,
+    Rule: execute_rule_on_object,
+    ConditionalExpression: execute_conditional_expression_on_object,
+    GroupExpression: execute_group_expression_on_object,
+    ObjectFilter: execute_filter_on_object,
+}
+
+def _rule_criteria(expression: bool | dict) -> set[str]:
+    """Returns the criterion of every rule in a logical expression."""
+    criteria = set()
+    stack = [expression]
+    while stack:
+        exp = stack.pop()
+        expression_type = get_logical_expression_type(exp)
+        if expression_type == "rule":
+            criteria.add(exp["criterion"])
+        elif expression_type == "conditional_expression":
+            stack.extend(exp[key] for key in ("if", "then", "else"))
+        elif expression_type == "group_expression":
+            stack.extend(exp["logical_expressions"])
+        elif expression_type == "filter":
+            stack.append(exp["logical_expression"])
+    return criteria
+
+def _method_criteria(cls: type, criteria: Iterable[str]) -> frozenset[str]:
+    """Returns the criteria that are methods of cls. Expressions compiled for cls call these by name, so they cannot be used on instances whose own attributes shadow them."""
+    return frozenset(criterion for criterion in criteria if callable(getattr(cls, criterion, None)))
+
+_SANITIZED_FILTER_CACHE: dict[str, tuple[dict, str]] = {}
+
+def _get_sanitized_filter(filter: dict) -> tuple[dict, str]:
+    """Returns `sanitize_filter(filter)` and the `repr` of its logical expression, for `_get_compiled_expression`.
+
+    Results are cached by the `repr` of filter, like compiled expressions, so a filter that is changed after its first use is sanitized again. The sanitized filter is a copy that is never returned to callers, so it cannot be changed after it is cached. Its size is checked before it is cached.
+
+    Raises:
+        TypeError: If the filter is not a dict.
+        ValueError: If the filter's JSON serialization exceeds 100 kilobytes (102,400 bytes).
+    """
+    key = repr(filter)
+    entry = _SANITIZED_FILTER_CACHE.get(key)
+    if entry is None:
+        sanitized = sanitize_filter(filter)
+        if get_filter_size(sanitized) > MAX_FILTER_SIZE:
+            raise ValueError("Size of filter dictionary must be less than or equal to 100 kilobytes (1024 bytes per kilobyte).")
+        if len(_SANITIZED_FILTER_CACHE) >= 1024:
+            _SANITIZED_FILTER_CACHE.clear()
+        entry = _SANITIZED_FILTER_CACHE[key] = (sanitized, repr(sanitized.get("logical_expression")))
+    return entry
+
+_COMPILED_EXPRESSION_CACHE: dict[tuple[type, str], tuple[Callable[[Any], bool], frozenset[str]]] = {}
+
+def _get_compiled_expression(filter: dict, obj: Any, expression_key: str | None = None) -> Callable[[Any], bool]:
+    """Returns `filter["logical_expression"]` compiled for objects of the same type as obj.
+
+    Compiled expressions are cached by the type of obj and the `repr` of the logical expression, which tells apart the values allowed in filters (e.g. 1, 1.0, True, and "1"). A filter that is changed after its first use is therefore compiled again. Each expression is compiled from a copy, so the cache does not keep the filter alive or read from it later. Objects whose own attributes shadow a method criterion are evaluated without compiling. `expression_key` may be given if the `repr` of the logical expression is already known.
+    """
+    expression = filter["logical_expression"]
+    key = (type(obj), repr(expression) if expression_key is None else expression_key)
+    entry = _COMPILED_EXPRESSION_CACHE.get(key)
+    if entry is None:
+        if len(_COMPILED_EXPRESSION_CACHE) >= 1024:
+            _COMPILED_EXPRESSION_CACHE.clear()
+        expression_copy = copy.deepcopy(expression)
+        if isinstance(expression_copy, dict):
+            _intern_strings(expression_copy)
+        entry = _COMPILED_EXPRESSION_CACHE[key] = (_compile_logical_expression(expression_copy, obj), _method_criteria(type(obj), _rule_criteria(expression_copy)))
+    compiled_expression, method_criteria = entry
+    instance_dict = getattr(obj, "__dict__", None)
+    if method_criteria and instance_dict and not method_criteria.isdisjoint(instance_dict):
+        return lambda obj: execute_logical_expression_on_object(obj, expression)
+    return compiled_expression
+
+def _array_types_match(obj_array: Iterable[Any], target_type_names: Iterable[str]) -> bool:
+    """Evaluates `type_name_matches` for every element of obj_array, checking each distinct element type only once."""
+    representatives = {}
+    for obj in obj_array:
+        representatives.setdefault(type(obj), obj)
+    if not isinstance(target_type_names, frozenset):
+        target_type_names = frozenset(target_type_names)
+    return all(type_name_matches(obj, target_type_names) for obj in representatives.values())
+
+def _array_samples(obj_array: Iterable[Any], criteria: Iterable[str]) -> tuple[list[Any], bool]:
+    """Returns the elements of obj_array that filters with the given criteria must be validated on, and whether criteria resolved from the first element can be used for every element.
+
+    The samples are one element of each distinct type, plus every element whose own attributes shadow a method criterion of its class.
+    """
+    representatives = {}
+    shadowed_methods = {}   # method criteria of each type whose instances have a __dict__
+    shadowing = []
+    for obj in obj_array:
+        cls = type(obj)
+        if cls not in representatives:
+            representatives[cls] = obj
+            if cls.__dictoffset__:
+                shadowed_methods[cls] = _method_criteria(cls, criteria)
+        methods = shadowed_methods.get(cls)
+        if methods and not methods.isdisjoint(obj.__dict__):
+            shadowing.append(obj)
+    return [*representatives.values(), *shadowing], len(representatives) == 1 and not shadowing
 
 def execute_filter_on_array(obj_array: np.ndarray[Any], filter: dict, sanitize: bool = True) -> np.ndarray[bool]:
     """Evaluates a filter on each element in an array. Returns an array with the result of evaluating the filter on each element.
@@ -522,13 +1513,69 @@ def execute_filter_on_array(obj_array: np.ndarray[Any], filter: dict, sanitize:
     """
     if sanitize:
         filter = sanitize_filter(filter)
-    if not is_filter_valid(filter, obj_array[0]):   # use first element because np.ndarray element types are homogeneous
+    # validated once for each type, since a subclass may override a whitelisted method without @filter_criterion
+    samples, shared_criteria = _array_samples(obj_array, _rule_criteria(filter))
+    if not all(is_filter_valid(filter, obj) for obj in samples):
         raise ValueError("Filter is not valid.")
     
-    return np.array([execute_filter_on_object(obj, filter, sanitize=False) for obj in obj_array], dtype=bool)
+    # the filter's type check was done for the whole array above, so only its logical expression is compiled
+    obj_array = _as_object_array(obj_array)
+    # criteria can only be resolved from a sample if it applies to every object
+    compiled_filter = CompiledFilter.from_logical_expression(filter["logical_expression"], obj_array[0] if shared_criteria else None)
+    return _compile_vectorized(compiled_filter)(obj_array)
+
+def execute_filter_on_wrapper_batch(wrapper: "ObjectWrapper", filter: dict, sanitize: bool = True) -> np.ndarray[bool]:
+    """Evaluates a filter on each object wrapped by an ObjectWrapper. Returns an array with the result of evaluating the filter on each wrapped object.
+
+    Unlike `execute_filter_on_object`, which evaluates the filter once on the combined values of the wrapped objects according to each rule's `multi_value_behavior`, this evaluates the filter on every wrapped object separately. Rules on numeric attributes and on methods with vectorized twins are evaluated as NumPy operations over all of the objects at once. Use `.all()` or `.any()` on the result to check whether every or any wrapped object passed.
+
+    Args:
+        wrapper (ObjectWrapper): An ObjectWrapper of a list of objects.
+        filter (dict): A filter to execute.
+        sanitize (bool, optional): Whether or not to remove character from the filter outside the ASCII range 32 to 126. Defaults to True.
+
+    Raises:
+        TypeError: If wrapper is not an ObjectWrapper of an iterable.
+        ValueError: If the filter is not valid for the type of any wrapped object, according to the documentation.
+
+    Returns:
+        np.ndarray[bool]: For each wrapped object, whether the filter evaluated to True.
+    """
+    if not isinstance(wrapper, ObjectWrapper) or not isinstance(wrapper._obj, Iterable):
+        raise TypeError("wrapper must be an ObjectWrapper of an iterable.")
+    if sanitize:
+        filter = sanitize_filter(filter)
+    obj_array = _as_object_array(wrapper._obj)
+    if len(obj_array) == 0:
+        return np.zeros(0, dtype=bool)
+
+    samples, shared_criteria = _array_samples(obj_array, _rule_criteria(filter))
+    if not all(is_filter_valid(filter, obj) for obj in samples):
+        raise ValueError("Filter is not valid.")
+
+    # criteria can only be resolved from a sample if it applies to every object
+    compiled_filter = CompiledFilter.from_logical_expression(filter["logical_expression"], obj_array[0] if shared_criteria else None)
+    return _compile_vectorized(compiled_filter)(obj_array)
+
+_SORT_CACHE = _IdentityCache()
+_FILTER_SORT_KEY = operator.itemgetter("priority", "name")
 
 def sort_filter_list(filter_list: list[dict]) -> list[dict]:
-    return sorted(filter_list, key=lambda x: (x["priority"], x["name"]))
+    """Sorts a list of filters primarily by `filter["priority"]` and secondarily by `filter["name"]`.
+
+    The order is cached per list and reused while the list contains the same filters, so a filter's priority and name should not be changed after its first use.
+
+    Args:
+        filter_list (list[dict]): The list of filters to sort.
+
+    Returns:
+        list[dict]: A new, sorted list of the filters.
+    """
+    filter_ids = tuple(map(id, filter_list))
+    cached = _SORT_CACHE.get(filter_list)
+    if cached is None or cached[0] != filter_ids:
+        cached = _SORT_CACHE.set(filter_list, (filter_ids, tuple(sorted(filter_list, key=_FILTER_SORT_KEY))))
+    return list(cached[1])
 
 def execute_filter_list_on_object(obj: Any, filter_list: list[dict], sanitize: bool = True) -> np.ndarray[bool]:
     """Evaluates a list of filters on an object. Returns an array with the evaluation result of each filter.
@@ -546,7 +1593,7 @@ def execute_filter_list_on_object(obj: Any, filter_list: list[dict], sanitize: b
     filter_list = sort_filter_list(filter_list)
     if sanitize:
         filter_list = [sanitize_filter(f) for f in filter_list]
-    return np.array([execute_filter_on_object(obj, f, sanitize=False) for f in filter_list], dtype=bool)
+    return np.fromiter((execute_filter_on_object(obj, f, sanitize=False) for f in filter_list), dtype=bool, count=len(filter_list))
 
 def execute_filter_list_on_array(obj_array: np.ndarray[Any], filter_list: list[dict], sanitize: bool = True) -> np.ndarray[bool]:
     """Evaluates a list of filters on every object in an array. Returns an array with the evaluation result of the filter list on each element.
@@ -556,18 +1603,35 @@ def execute_filter_list_on_array(obj_array: np.ndarray[Any], filter_list: list[d
         filter_list (list[dict]): A list of filters to execute on the elements of `obj_array`.
         sanitize (bool, optional): Whether or not to remove character from the filter outside the ASCII range 32 to 126. Defaults to True.
 
+    Raises:
+        ValueError: If any filter in `filter_list` is not valid, according to the documentation.
+
     Returns:
         np.ndarray[bool]: For each element of `obj_array`, whether the filter list evaluated to True.
     """
     filter_list = sort_filter_list(filter_list)
     if sanitize:
         filter_list = [sanitize_filter(f) for f in filter_list]
-    return np.array([all(execute_filter_list_on_object(obj, filter_list, sanitize=False)) for obj in obj_array], dtype=bool)
+    # validated once for each type, since a subclass may override a whitelisted method without @filter_criterion
+    samples, shared_criteria = _array_samples(obj_array, set().union(*map(_rule_criteria, filter_list)))
+    for f in filter_list:
+        if not all(is_filter_valid(f, obj) for obj in samples):
+            raise ValueError("Filter is not valid.")
+
+    # every filter reads criteria through one cache per object, so criteria shared between filters are only fetched once
+    values = {}
+    sample = obj_array[0] if shared_criteria else None
+    compiled_expressions = [_compile_logical_expression(f["logical_expression"], sample, values) for f in filter_list]
+    result = np.empty(len(obj_array), dtype=bool)
+    for index, obj in enumerate(obj_array):
+        values.clear()
+        result[index] = all(compiled_expression(obj) for compiled_expression in compiled_expressions)
+    return result
 
 def execute_filter_list_on_object_get_first_success(obj: Any, filter_list: list[dict], sanitize: bool = True) -> str:
     """Evaluates a list of filters on an object. Returns the name of the first successful filter, if any exists.
 
-    This function sorts `filter_list` before executing its elements. Filters are primarily ordered by `filter["priority"]` and secondarily ordered by `filter["name"]`.
+    This function sorts `filter_list` before executing its elements. Filters are primarily ordered by `filter["priority"]` and secondarily ordered by `filter["name"]`. Filters after the first successful one are not executed.
 
     Args:
         obj (Any): Any object.
@@ -576,17 +1640,79 @@ def execute_filter_list_on_object_get_first_success(obj: Any, filter_list: list[
 
     Raises:
         ValueError: If `obj` did not pass any filter in `filter_list`
+        ValueError: If a filter executed before the first successful one is not valid, according to the documentation.
 
     Returns:
         str: The name of the first successful filter in `filter_list`
     """
     filter_list = sort_filter_list(filter_list)
-    results = execute_filter_list_on_object(obj, filter_list, sanitize=sanitize)
-    for index, passed in enumerate(results):
-        if passed:
-            return filter_list[index]["name"]
+    for f in filter_list:
+        if execute_filter_on_object(obj, f, sanitize=sanitize):     # reuses the expression compiled for this filter and type
+            return f["name"]
     raise ValueError("obj did not pass any filters in filter_list")
 
+_METHOD_CACHE: dict[tuple[frozenset[type], str], tuple[bool, Callable | None]] = {}
+
+def _get_method_dispatch(types: frozenset[type], name: str) -> tuple[bool, Callable | None]:
+    """Determines whether name is a method of every type in types, and the vectorized twin they all share, if any. Cached per set of types and name."""
+    key = (types, name)
+    try:
+        return _METHOD_CACHE[key]
+    except KeyError:
+        pass
+    if len(_METHOD_CACHE) >= 1024:
+        _METHOD_CACHE.clear()
+    methods = [getattr(cls, name, None) for cls in types]
+    is_method = all(callable(method) for method in methods)
+    twins = {getattr(method, "_vectorized", None) for method in methods}
+    twin = twins.pop() if is_method and len(twins) == 1 else None
+    result = _METHOD_CACHE[key] = (is_method, twin)
+    return result
+
+class _Columns(dict):
+    """The attributes of a list of objects stored as one NumPy array per attribute, keyed by attribute name. Each array is built on first access.
+
+    Columns of floats are float64 arrays, which compute like Python floats. Other columns are object arrays of the attribute values, so that e.g. products of ints cannot overflow like int64 would.
+    """
+
+    def __init__(self, objs: Iterable[Any]) -> None:
+        super().__init__()
+        self._objs = objs
+
+    def __missing__(self, name: str) -> np.ndarray:
+        values = [getattr(obj, name) for obj in self._objs]
+        if set(map(type, values)) <= {float}:
+            column = np.array(values, dtype=np.float64)
+        else:
+            column = np.fromiter(values, dtype=object, count=len(values))
+        self[name] = column
+        return column
+
+def _call_twin(twin: Callable[..., np.ndarray], objs: Iterable[Any], args: tuple, kwargs: dict) -> np.ndarray:
+    """Calls a vectorized twin on the columns of objs, which are built on each call since the objects may have changed. Returns an array with the result for each object; a scalar result applies to every object."""
+    with np.errstate(all="ignore"):     # like Python floats, e.g. inf * 0 is nan without a warning
+        values = np.asarray(twin(_Columns(objs), *args, **kwargs))
+    return np.broadcast_to(values, (len(objs), ))
+
+def _call_by_kind(wrapper: "ObjectWrapper", name: str, args: tuple, kwargs: dict) -> list:
+    """Calls a method on every object of a mixed-type ObjectWrapper, grouping the objects by type so each type's vectorized twin can be called once on its objects. Types without a twin call the method on each object."""
+    codes = {}  # code of each type, in order of first appearance
+    kinds = np.fromiter((codes.setdefault(type(item), len(codes)) for item in wrapper._obj), dtype=np.intp, count=len(wrapper._obj))
+    kind_types = tuple(codes)
+
+    result = [None] * len(kinds)
+    call = operator.methodcaller(name, *args, **kwargs)
+    for code, cls in enumerate(kind_types):
+        indices = np.flatnonzero(kinds == code).tolist()
+        twin = _get_method_dispatch(frozenset((cls, )), name)[1]
+        if twin is None:
+            values = [call(wrapper._obj[i]) for i in indices]
+        else:
+            values = _call_twin(twin, [wrapper._obj[i] for i in indices], args, kwargs).tolist()
+        for i, value in zip(indices, values):
+            result[i] = value
+    return result
+
 class ObjectWrapper:
     """A class that accepts objects of mixed types. Evaluates methods and accesses instance variables and properties for each. Ignores presence or lack of @filter_criterion.
     """
@@ -598,6 +1724,20 @@ class ObjectWrapper:
     def __getattr__(self, name) -> Any | Callable:
         # Check if all objects in the iterable (or the single object) have the attribute
         if isinstance(self._obj, Iterable):
+            types = frozenset(map(type, self._obj))    # taken on each access, since the wrapped list may have changed
+            is_method, twin = _get_method_dispatch(types, name) if types else (False, None)
+            if twin is not None:
+                def method(*args, **kwargs):
+                    return _call_twin(twin, self._obj, args, kwargs).tolist()
+                return method
+            if is_method and len(types) > 1 and any(_get_method_dispatch(frozenset((cls, )), name)[1] is not None for cls in types):
+                def method(*args, **kwargs):
+                    return _call_by_kind(self, name, args, kwargs)
+                return method
+            if is_method:
+                def method(*args, **kwargs):
+                    return list(map(operator.methodcaller(name, *args, **kwargs), self._obj))
+                return method
             if all(hasattr(item, name) for item in self._obj):
                 # Return a callable function if the attribute is a method
                 if callable(getattr(self._obj[0], name)):
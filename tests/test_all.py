@@ -1,21 +1,29 @@
 # (c) 2024 Scott Ratchford
 # This file is licensed under the MIT License. See LICENSE.txt for details.
 
-import unittest
-from src import object_filtering
+import copy
+import json
+import os
+import subprocess
+import sys
+from decimal import Decimal
+import object_filtering     # the package name, so numba's on-disk cache refers to the module it is installed as
+import numpy as np
 import pytest
 
 
 class Shape:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int | float, y: int | float):
         self.x: int | float = x
         self.y: int | float = y
 
-    @object_filtering.filter_criterion
+    @object_filtering.filter_criterion(vectorized=lambda columns: columns["x"] * columns["y"])
     def area(self) -> int | float:
         return self.x * self.y
     
-    @object_filtering.filter_criterion
+    @object_filtering.filter_criterion(vectorized=lambda x, y, z: x * y * z, columns=("x", "y"))
     def volume(self, z: int | float) -> int | float:
         return self.area() * z
     
@@ -23,6 +31,8 @@ class Shape:
         return
     
 class Point:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: int | float, y: int | float) -> None:
         self.x: int | float = x
         self.y: int | float = y
@@ -38,13 +48,37 @@ class Point:
     def secret_method(self) -> None:
         return
 
-SHAPE_1 = Shape(1, 2)
-SHAPE_2 = Shape(2, 4)
-SHAPE_3 = Shape(3, 6)
+class CountingShape(Shape):
+    area_calls = 0
+
+    @object_filtering.filter_criterion
+    def area(self) -> int | float:
+        CountingShape.area_calls += 1
+        return super().area()
+
+@pytest.fixture
+def shape_1():
+    return Shape(1, 2)
 
-SHAPE_BIG = Shape(3, 4)
-SHAPE_MEDIUM = Shape(2, 2)
-SHAPE_SMALL = Shape(1, 1)
+@pytest.fixture
+def shape_2():
+    return Shape(2, 4)
+
+@pytest.fixture
+def shape_3():
+    return Shape(3, 6)
+
+@pytest.fixture
+def shape_big():
+    return Shape(3, 4)
+
+@pytest.fixture
+def shape_medium():
+    return Shape(2, 2)
+
+@pytest.fixture
+def shape_small():
+    return Shape(1, 1)
 
 RULE_X = {
     "criterion": "x",
@@ -406,6 +440,32 @@ SHAPE_FILTER_FLOAT = {
     }
 }
 
+GROUP_FILTER_OR = {
+    "name": "Shape Size: Or",
+    "description": "Used to determine whether either side of a Shape is at least 2.5.",
+    "priority": 1,
+    "object_types": ["Shape"],
+    "logical_expression": {
+        "logical_operator": "or",
+        "logical_expressions": [
+            {
+                "criterion": "x",
+                "operator": ">=",
+                "comparison_value": 2.5,
+                "parameters": [],
+                "multi_value_behavior": "none"
+            },
+            {
+                "criterion": "y",
+                "operator": ">",
+                "comparison_value": 2,
+                "parameters": [],
+                "multi_value_behavior": "none"
+            }
+        ]
+    }
+}
+
 MIXED_FILTER = {
     "name": "Mixed Type Filter",
     "description": "Used to determine whether Shapes and Points can be filtered together.",
@@ -446,54 +506,135 @@ MIXED_FILTER = {
     }
 }
 
-HIGH_X_FILTER = object_filtering.ObjectFilter(
-    name="High X",
-    description="Checks for a high x value.",
-    priority=0,
-    logical_expression=object_filtering.Rule(
-        criterion="x",
-        operator=">=",
-        comparison_value=10,
-        multi_value_behavior="none"
+@pytest.fixture
+def high_x_filter():
+    return object_filtering.ObjectFilter(
+        name="High X",
+        description="Checks for a high x value.",
+        priority=0,
+        logical_expression=object_filtering.Rule(
+            criterion="x",
+            operator=">=",
+            comparison_value=10,
+            multi_value_behavior="none"
+        )
     )
-)
-
-HIGH_Y_FILTER = object_filtering.ObjectFilter(
-    name="High Y",
-    description="Checks for a high y value.",
-    priority=1,
-    logical_expression=object_filtering.Rule(
-        criterion="y",
-        operator=">=",
-        comparison_value=10,
-        multi_value_behavior="none"
+
+@pytest.fixture
+def high_y_filter():
+    return object_filtering.ObjectFilter(
+        name="High Y",
+        description="Checks for a high y value.",
+        priority=1,
+        logical_expression=object_filtering.Rule(
+            criterion="y",
+            operator=">=",
+            comparison_value=10,
+            multi_value_behavior="none"
+        )
     )
-)
-
-LOW_Y_FILTER = object_filtering.ObjectFilter(
-    name="Low Y",
-    description="Checks for a low y value.",
-    priority=1,
-    logical_expression=object_filtering.Rule(
-        criterion="y",
-        operator="<",
-        comparison_value=10,
-        multi_value_behavior="none"
+
+@pytest.fixture
+def low_y_filter():
+    return object_filtering.ObjectFilter(
+        name="Low Y",
+        description="Checks for a low y value.",
+        priority=1,
+        logical_expression=object_filtering.Rule(
+            criterion="y",
+            operator="<",
+            comparison_value=10,
+            multi_value_behavior="none"
+        )
     )
-)
 
-class TestObjectWrapper(unittest.TestCase):
-    def test_multiple_objects(self):
-        wrapper = object_filtering.ObjectWrapper([SHAPE_1, SHAPE_2, SHAPE_3])
+@pytest.fixture
+def shape_filters():
+    return copy.deepcopy((SHAPE_FILTER_1, SHAPE_FILTER_2, SHAPE_FILTER_3, SHAPE_FILTER_4, SHAPE_FILTER_5, SHAPE_FILTER_6))
+
+class TestObjectWrapper:
+    def test_multiple_objects(self, shape_1, shape_2, shape_3):
+        wrapper = object_filtering.ObjectWrapper([shape_1, shape_2, shape_3])
 
         assert object_filtering.type_name_matches(wrapper, "Shape")
         assert wrapper.x == [1, 2, 3]
         assert wrapper.y == [2, 4, 6]
         assert wrapper.area() == [2, 8, 18]
         assert wrapper.volume(3) == [6, 24, 54]
+        big_shapes = [Shape(2**40, 2**40), Shape(2**40, 0.5)]
+        assert object_filtering.ObjectWrapper(big_shapes).area() == [2**80, 2.0**39]   # ints do not overflow
+
+        # large enough to compile volume()'s twin with numba when numba is installed
+        shapes = [Shape(i % 7, i % 5 + 0.5) for i in range(2 * object_filtering.NUMBA_MIN_ARRAY_SIZE)]
+        assert object_filtering.ObjectWrapper(shapes).volume(3) == [shape.volume(3) for shape in shapes]
+        assert object_filtering.ObjectWrapper(shapes).volume(z=3) == [shape.volume(z=3) for shape in shapes]
+        float_shapes = [Shape(float(shape.x), shape.y) for shape in shapes]  # float64 columns, which numba can compile
+        assert object_filtering.ObjectWrapper(float_shapes).volume(z=3) == [shape.volume(z=3) for shape in float_shapes]
+        assert object_filtering.ObjectWrapper(float_shapes).volume(z=3.5) == [shape.volume(z=3.5) for shape in float_shapes]
+        assert wrapper.volume(z=3) == [6, 24, 54]
+
+        mixed_wrapper = object_filtering.ObjectWrapper([shape_1, Point(1, 2)])
+        assert mixed_wrapper.area() == [2, 0]  # Point has no vectorized twin, so each Point's area() is called
+        assert mixed_wrapper.volume(z=3) == [6, 0]
+
+        interleaved = [shape_1, Point(1, 2), shape_2, Point(3, 4), shape_3]
+        interleaved_wrapper = object_filtering.ObjectWrapper(interleaved)
+        assert interleaved_wrapper.area() == [obj.area() for obj in interleaved]
+        assert interleaved_wrapper.volume(2) == [obj.volume(2) for obj in interleaved]
+        assert interleaved_wrapper.volume(z=2) == [obj.volume(z=2) for obj in interleaved]
+        assert mixed_wrapper.x == [1, 1]
+        with pytest.raises(AttributeError):
+            mixed_wrapper.perimeter()
+
+        shape_1.x = 10
+        assert wrapper.area() == [20, 8, 18]    # values are read again on each call
+        assert mixed_wrapper.volume(z=3) == [60, 0]
+
+    def test_numba_imported_lazily(self):
+        code = "import sys\nimport object_filtering\nassert 'numba' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], check=True, env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+
+    def test_generated_twin(self):
+        namespace = {}
+        exec("def twin(x, y, z):\n    return x * y * z", namespace)   # has no source file for numba to cache it next to
+
+        class GeneratedShape(Shape):
+            __slots__ = ()
+
+            @object_filtering.filter_criterion(vectorized=namespace["twin"], columns=("x", "y"))
+            def volume(self, z: int | float = 0) -> int | float:
+                return self.x * self.y * z
+
+        shapes = [GeneratedShape(i + 0.5, 2.0) for i in range(object_filtering.NUMBA_MIN_ARRAY_SIZE)]
+        assert object_filtering.ObjectWrapper(shapes).volume(3) == [shape.volume(3) for shape in shapes]
 
-    def test_single_object(self):
-        single_wrapper = object_filtering.ObjectWrapper(SHAPE_1)
+    def test_twin_results(self, recwarn):
+        class Flat(Shape):
+            __slots__ = ()
+
+            @object_filtering.filter_criterion(vectorized=lambda columns: 0)   # the same result for every object
+            def area(self) -> int:
+                return 0
+
+        assert object_filtering.ObjectWrapper([Flat(1, 2), Flat(3, 4)]).area() == [0, 0]
+        assert object_filtering.ObjectWrapper([Flat(1, 2), Point(3, 4)]).area() == [0, 0]
+        huge_shapes = [Shape(1e300, 1e300), Shape(2.0, 3.0)]
+        assert object_filtering.ObjectWrapper(huge_shapes).area() == [float("inf"), 6.0]
+        assert object_filtering.ObjectWrapper(huge_shapes + [Point(1, 2)]).area() == [float("inf"), 6.0, 0]
+        assert not [warning for warning in recwarn if issubclass(warning.category, RuntimeWarning)]   # overflow gives inf silently, like Python floats
+
+    def test_list_modified(self):
+        shapes = [Shape(2, 3)]
+        wrapper = object_filtering.ObjectWrapper(shapes)
+        assert wrapper.area() == [6]
+        shapes.append(Point(5, 5))  # the wrapper reads the list again on each access
+        assert wrapper.area() == [6, 0]
+        assert wrapper.volume(z=2) == [12, 0]
+        shapes[1:] = [Shape(5, 5)]
+        assert wrapper.area() == [6, 25]
+
+    def test_single_object(self, shape_1):
+        single_wrapper = object_filtering.ObjectWrapper(shape_1)
         
         assert object_filtering.type_name_matches(single_wrapper, "Shape")
         assert single_wrapper.x == 1
@@ -501,75 +642,144 @@ class TestObjectWrapper(unittest.TestCase):
         assert single_wrapper.area() == 2
         assert single_wrapper.volume(3) == 6
 
-class TestLogicalExpressionValidity(unittest.TestCase):
-    def test_rule(self):
-        assert object_filtering.is_rule_valid(RULE_X, SHAPE_BIG)
-        assert object_filtering.is_rule_valid(RULE_Y, SHAPE_BIG)
-        assert object_filtering.is_rule_valid(RULE_VOLUME, SHAPE_BIG)
-        assert not object_filtering.is_rule_valid(RULE_SECRET, SHAPE_BIG)  # not decorated with @object_filtering.filter_criterion
+    def test_type_name_matches(self, shape_1):
+        assert object_filtering.type_name_matches(shape_1, ["Shape"])
+        assert object_filtering.type_name_matches(shape_1, ["object"])   # base classes match too
+        assert not object_filtering.type_name_matches(shape_1, ["Point"])
+        assert not object_filtering.type_name_matches(shape_1, "Shap")
+        assert not object_filtering.type_name_matches(object_filtering.ObjectWrapper([shape_1, Point(1, 2)]), ["Shape"])
 
-    def test_conditional(self):
-        assert object_filtering.is_conditional_expression_valid(CONDITIONAL_1, SHAPE_BIG)
-        assert object_filtering.is_conditional_expression_valid(CONDITIONAL_2, SHAPE_BIG)
+class TestLogicalExpressionValidity:
+    def test_rule(self, shape_big):
+        assert object_filtering.is_rule_valid(RULE_X, shape_big)
+        assert object_filtering.is_rule_valid(RULE_Y, shape_big)
+        assert object_filtering.is_rule_valid(RULE_VOLUME, shape_big)
+        assert not object_filtering.is_rule_valid(RULE_SECRET, shape_big)  # not decorated with @object_filtering.filter_criterion
+
+        shadowed_shape = CountingShape(2, 2)     # unlike Shape, has a __dict__
+        shadowed_shape.area = shadowed_shape.secret_method   # an instance attribute hides the whitelisted method
+        assert not object_filtering.is_rule_valid(RULE_AREA, shadowed_shape)
+
+    def test_rule_unwhitelisted(self):
+        class Box:
+            @object_filtering.filter_criterion
+            def area(self) -> int:
+                return 9
+
+        assert object_filtering.is_rule_valid(RULE_AREA, Box())
+        assert object_filtering.get_value(Box(), RULE_AREA) == 9
+        Box.area._is_whitelisted = False    # whitelisting can be revoked at runtime
+        assert not object_filtering.is_rule_valid(RULE_AREA, Box())
+        with pytest.raises(ValueError):
+            object_filtering.get_value(Box(), RULE_AREA)
 
-    def test_group(self):
-        assert object_filtering.is_group_expression_valid(GROUP_1, SHAPE_BIG)
-        assert object_filtering.is_group_expression_valid(GROUP_2, SHAPE_BIG)
+    def test_conditional(self, shape_big):
+        assert object_filtering.is_conditional_expression_valid(CONDITIONAL_1, shape_big)
+        assert object_filtering.is_conditional_expression_valid(CONDITIONAL_2, shape_big)
 
-    def test_logical(self):
+    def test_group(self, shape_big):
+        assert object_filtering.is_group_expression_valid(GROUP_1, shape_big)
+        assert object_filtering.is_group_expression_valid(GROUP_2, shape_big)
+
+    def test_logical(self, shape_big):
         logical_expressions = [RULE_X, RULE_Y, RULE_AREA, RULE_VOLUME, CONDITIONAL_1, CONDITIONAL_2, GROUP_1, GROUP_2]
         for exp in logical_expressions:
-            assert object_filtering.is_logical_expression_valid(exp, SHAPE_BIG)
-        assert not object_filtering.is_logical_expression_valid(RULE_SECRET, SHAPE_BIG)
-
-class TestLogicalExpressionResult(unittest.TestCase):
-    def test_rule(self):
-        assert object_filtering.execute_rule_on_object(SHAPE_BIG, RULE_X)
-        assert object_filtering.execute_rule_on_object(SHAPE_BIG, RULE_Y)
-        assert object_filtering.execute_rule_on_object(SHAPE_BIG, RULE_VOLUME)
+            assert object_filtering.is_logical_expression_valid(exp, shape_big)
+        assert not object_filtering.is_logical_expression_valid(RULE_SECRET, shape_big)
+
+class TestLogicalExpressionResult:
+    def test_rule(self, shape_big):
+        assert object_filtering.execute_rule_on_object(shape_big, RULE_X)
+        assert object_filtering.execute_rule_on_object(shape_big, RULE_Y)
+        assert object_filtering.execute_rule_on_object(shape_big, RULE_VOLUME)
         with pytest.raises(AttributeError):
-            object_filtering.execute_rule_on_object(SHAPE_BIG, RULE_SECRET)  # not decorated with @object_filtering.filter_criterion
+            object_filtering.execute_rule_on_object(shape_big, RULE_SECRET)  # not decorated with @object_filtering.filter_criterion
+
+        rule = {"criterion": "x", "operator": ">=", "comparison_value": 3, "parameters": [], "multi_value_behavior": "none"}
+        assert object_filtering.is_rule_valid(rule, shape_big)
+        assert object_filtering.execute_rule_on_object(shape_big, rule)
+        rule["operator"] = "<"  # rules are read again on every execution
+        assert not object_filtering.execute_rule_on_object(shape_big, rule)
+        rule["criterion"] = "y"
+        rule["comparison_value"] = 5
+        assert object_filtering.execute_rule_on_object(shape_big, rule)
+
+        shadowed_shape = CountingShape(2, 2)
+        assert object_filtering.get_value(shadowed_shape, RULE_AREA) == 4
+        shadowed_shape.area = shadowed_shape.secret_method   # an instance attribute hides the whitelisted method
+        with pytest.raises(AttributeError):
+            object_filtering.execute_rule_on_object(shadowed_shape, RULE_AREA)
+
+    def test_conditional(self, shape_big):
+        assert object_filtering.execute_conditional_expression_on_object(shape_big, CONDITIONAL_1)
+        assert object_filtering.execute_conditional_expression_on_object(shape_big, CONDITIONAL_2)
+
+    def test_group(self, shape_big):
+        assert object_filtering.execute_group_expression_on_object(shape_big, GROUP_1)
+        assert object_filtering.execute_group_expression_on_object(shape_big, GROUP_2)
 
-    def test_conditional(self):
-        assert object_filtering.execute_conditional_expression_on_object(SHAPE_BIG, CONDITIONAL_1)
-        assert object_filtering.execute_conditional_expression_on_object(SHAPE_BIG, CONDITIONAL_2)
+    def test_group_short_circuit(self, shape_big):
+        # RULE_SECRET raises if evaluated, so these only pass if evaluation stops at the decisive child
+        assert not object_filtering.execute_group_expression_on_object(shape_big, {"logical_operator": "and", "logical_expressions": [False, RULE_SECRET]})
+        assert object_filtering.execute_group_expression_on_object(shape_big, {"logical_operator": "or", "logical_expressions": [True, RULE_SECRET]})
 
-    def test_group(self):
-        assert object_filtering.execute_group_expression_on_object(SHAPE_BIG, GROUP_1)
-        assert object_filtering.execute_group_expression_on_object(SHAPE_BIG, GROUP_2)
+    def test_group_cost_order(self, shape_big):
+        # booleans are cheaper than rules, so they are evaluated first regardless of their position
+        assert not object_filtering.execute_group_expression_on_object(shape_big, {"logical_operator": "and", "logical_expressions": [RULE_SECRET, False]})
+        assert object_filtering.execute_group_expression_on_object(shape_big, {"logical_operator": "or", "logical_expressions": [RULE_SECRET, True]})
+        # rules with parameters call a method, so attribute rules are evaluated before them
+        secret_method_rule = {"criterion": "secret_method", "operator": "==", "comparison_value": 0, "parameters": [1], "multi_value_behavior": "none"}
+        x_rule = {"criterion": "x", "operator": "<", "comparison_value": 0, "parameters": [], "multi_value_behavior": "none"}
+        assert not object_filtering.execute_group_expression_on_object(shape_big, {"logical_operator": "and", "logical_expressions": [secret_method_rule, x_rule]})
 
-    def test_logical(self):
+    def test_group_modified(self, shape_big):
+        group = {"logical_operator": "and", "logical_expressions": [True]}
+        assert object_filtering.execute_group_expression_on_object(shape_big, group)
+        group["logical_expressions"].append(False)  # the evaluation order is not cached on the group
+        assert not object_filtering.execute_group_expression_on_object(shape_big, group)
+        assert group == {"logical_operator": "and", "logical_expressions": [True, False]}
+
+    def test_expression_type_modified(self, shape_big):
+        expression = {"criterion": "x", "operator": ">=", "comparison_value": 3, "parameters": [], "multi_value_behavior": "none"}
+        assert object_filtering.get_logical_expression_type(expression) == "rule"
+        assert object_filtering.execute_logical_expression_on_object(shape_big, expression)
+        expression.clear()
+        expression.update(logical_operator="and", logical_expressions=[False])  # the type is determined again on every use
+        assert object_filtering.get_logical_expression_type(expression) == "group_expression"
+        assert not object_filtering.execute_logical_expression_on_object(shape_big, expression)
+
+    def test_logical(self, shape_big):
         logical_expressions = [RULE_X, RULE_Y, RULE_AREA, RULE_VOLUME, CONDITIONAL_1, CONDITIONAL_2, GROUP_1, GROUP_2]
         for exp in logical_expressions:
-            assert object_filtering.execute_logical_expression_on_object(SHAPE_BIG, exp)
+            assert object_filtering.execute_logical_expression_on_object(shape_big, exp)
         with pytest.raises(AttributeError):
-            object_filtering.execute_logical_expression_on_object(SHAPE_BIG, RULE_SECRET)
+            object_filtering.execute_logical_expression_on_object(shape_big, RULE_SECRET)
 
-class TestFilter(unittest.TestCase):
-    def test_group_filters(self):
+class TestFilter:
+    def test_group_filters(self, shape_big, shape_medium, shape_small):
         for shape_filter in (SHAPE_FILTER_1, SHAPE_FILTER_2):
-            assert object_filtering.execute_filter_on_object(SHAPE_BIG, shape_filter)
-            assert object_filtering.execute_filter_on_object(SHAPE_MEDIUM, shape_filter)
-            assert not object_filtering.execute_filter_on_object(SHAPE_SMALL, shape_filter)
+            assert object_filtering.execute_filter_on_object(shape_big, shape_filter)
+            assert object_filtering.execute_filter_on_object(shape_medium, shape_filter)
+            assert not object_filtering.execute_filter_on_object(shape_small, shape_filter)
             
-    def test_conditional_filters(self):
+    def test_conditional_filters(self, shape_big, shape_medium, shape_small):
         for shape_filter in (SHAPE_FILTER_3, SHAPE_FILTER_4):
-            assert object_filtering.execute_filter_on_object(SHAPE_BIG, shape_filter)
-            assert object_filtering.execute_filter_on_object(SHAPE_MEDIUM, shape_filter)
-            assert not object_filtering.execute_filter_on_object(SHAPE_SMALL, shape_filter)
+            assert object_filtering.execute_filter_on_object(shape_big, shape_filter)
+            assert object_filtering.execute_filter_on_object(shape_medium, shape_filter)
+            assert not object_filtering.execute_filter_on_object(shape_small, shape_filter)
             
-    def test_simple_filter(self):
-        assert object_filtering.execute_filter_on_object(SHAPE_BIG, SHAPE_FILTER_5)
-        assert object_filtering.execute_filter_on_object(SHAPE_MEDIUM, SHAPE_FILTER_5)
-        assert not object_filtering.execute_filter_on_object(SHAPE_SMALL, SHAPE_FILTER_5)
+    def test_simple_filter(self, shape_big, shape_medium, shape_small):
+        assert object_filtering.execute_filter_on_object(shape_big, SHAPE_FILTER_5)
+        assert object_filtering.execute_filter_on_object(shape_medium, SHAPE_FILTER_5)
+        assert not object_filtering.execute_filter_on_object(shape_small, SHAPE_FILTER_5)
             
-    def test_nested_filter(self):
-        assert object_filtering.execute_filter_on_object(SHAPE_BIG, SHAPE_FILTER_6)
-        assert object_filtering.execute_filter_on_object(SHAPE_MEDIUM, SHAPE_FILTER_6)
-        assert not object_filtering.execute_filter_on_object(SHAPE_SMALL, SHAPE_FILTER_6)
+    def test_nested_filter(self, shape_big, shape_medium, shape_small):
+        assert object_filtering.execute_filter_on_object(shape_big, SHAPE_FILTER_6)
+        assert object_filtering.execute_filter_on_object(shape_medium, SHAPE_FILTER_6)
+        assert not object_filtering.execute_filter_on_object(shape_small, SHAPE_FILTER_6)
     
-    def test_filter_with_single_wrapper(self):
-        wrapper = object_filtering.ObjectWrapper(SHAPE_1)
+    def test_filter_with_single_wrapper(self, shape_1):
+        wrapper = object_filtering.ObjectWrapper(shape_1)
 
         assert object_filtering.is_filter_valid(SHAPE_FILTER_1, wrapper)
         assert object_filtering.is_filter_valid(SHAPE_FILTER_2, wrapper)
@@ -578,8 +788,8 @@ class TestFilter(unittest.TestCase):
         assert object_filtering.is_filter_valid(SHAPE_FILTER_5, wrapper)
         assert object_filtering.is_filter_valid(SHAPE_FILTER_6, wrapper)
     
-    def test_filter_with_multi_wrapper(self):
-        wrapper = object_filtering.ObjectWrapper([SHAPE_1, SHAPE_2, SHAPE_3])
+    def test_filter_with_multi_wrapper(self, shape_1, shape_2, shape_3):
+        wrapper = object_filtering.ObjectWrapper([shape_1, shape_2, shape_3])
 
         assert object_filtering.execute_filter_on_object(wrapper, SHAPE_FILTER_1)
         assert object_filtering.execute_filter_on_object(wrapper, SHAPE_FILTER_2)
@@ -588,8 +798,8 @@ class TestFilter(unittest.TestCase):
         assert object_filtering.execute_filter_on_object(wrapper, SHAPE_FILTER_5)
         assert object_filtering.execute_filter_on_object(wrapper, SHAPE_FILTER_6)
     
-    def test_filter_with_multi_wrapper_2(self):
-        wrapper = object_filtering.ObjectWrapper([SHAPE_2, SHAPE_2])
+    def test_filter_with_multi_wrapper_2(self, shape_2):
+        wrapper = object_filtering.ObjectWrapper([shape_2, shape_2])
 
         with pytest.raises(ValueError):
             object_filtering.execute_rule_on_object(wrapper, RULE_MULTI_NONE)
@@ -597,12 +807,293 @@ class TestFilter(unittest.TestCase):
         assert object_filtering.execute_rule_on_object(wrapper, RULE_MULTI_MEET)
         assert object_filtering.execute_rule_on_object(wrapper, RULE_MULTI_EQUAL)
 
+    def test_filter_with_modified_wrapper(self, shape_2):
+        shapes = [shape_2]
+        wrapper = object_filtering.ObjectWrapper(shapes)
+        shape_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=RULE_MULTI_MEET)
+        assert object_filtering.execute_filter_on_object(wrapper, shape_filter)
+        shapes.append(Point(5, 5))  # types are checked on the current contents of the list
+        assert not object_filtering.type_name_matches(wrapper, ["Shape"])
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_object(wrapper, shape_filter)
+
+    def test_filter_unchanged_by_execution(self, shape_big, shape_filters):
+        for shape_filter in shape_filters:
+            original = copy.deepcopy(shape_filter)
+            assert object_filtering.is_filter_valid(shape_filter, shape_big)
+            object_filtering.execute_filter_on_object(shape_big, shape_filter, sanitize=False)
+            object_filtering.execute_filter_on_array(np.array([shape_big]), shape_filter, sanitize=False)
+            assert shape_filter == original
+            assert json.loads(json.dumps(shape_filter)) == original
+
+    def test_filter_size_limit(self, shape_big):
+        assert object_filtering.get_filter_size(SHAPE_FILTER_1) < object_filtering.MAX_FILTER_SIZE
+        large_filter = dict(SHAPE_FILTER_5, description="a" * object_filtering.MAX_FILTER_SIZE)
+        with pytest.raises(ValueError):
+            object_filtering.is_filter_valid(large_filter, shape_big)
+
+        growing_filter = copy.deepcopy(SHAPE_FILTER_5)
+        assert object_filtering.is_filter_valid(growing_filter, shape_big)
+        growing_filter["description"] = "a" * object_filtering.MAX_FILTER_SIZE   # the size is measured again on every validation
+        with pytest.raises(ValueError):
+            object_filtering.is_filter_valid(growing_filter, shape_big)
+
+    def test_filter_strings_not_replaced(self, shape_big):
+        criterion = "".join(["ar", "ea"])   # built at runtime, so not interned
+        area_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=dict(RULE_AREA, criterion=criterion))
+        assert object_filtering.is_filter_valid(area_filter, shape_big)
+        assert object_filtering.execute_filter_on_object(shape_big, area_filter, sanitize=False)
+        assert area_filter["logical_expression"]["criterion"] is criterion    # only private copies of the filter are interned
+        assert set(area_filter["logical_expression"]) == set(RULE_AREA)
+
+    def test_object_types(self, shape_big):
+        type_filter = object_filtering.ObjectFilter(object_types=["Point", "Shape"], logical_expression=True)
+        assert object_filtering.is_filter_valid(type_filter, shape_big)
+        assert object_filtering.is_filter_valid(type_filter, Point(1, 1))
+        assert object_filtering.is_filter_valid(type_filter, CountingShape(1, 1))   # base classes match too
+        assert not object_filtering.is_filter_valid(type_filter, 1)
+        type_filter["object_types"].remove("Shape")    # the object types are read again on every validation
+        assert not object_filtering.is_filter_valid(type_filter, shape_big)
+
+    def test_parse_filter(self, shape_big, shape_medium, shape_small):
+        parsed_filter = object_filtering.parse_filter(SHAPE_FILTER_3)
+        assert isinstance(parsed_filter, object_filtering.ObjectFilter)
+        assert isinstance(parsed_filter["logical_expression"], object_filtering.ConditionalExpression)
+        assert object_filtering.get_filter_size(parsed_filter) == object_filtering.get_filter_size(SHAPE_FILTER_3)
+        assert isinstance(object_filtering.sanitize_filter(parsed_filter), object_filtering.ObjectFilter)
+        for shape in (shape_big, shape_medium, shape_small):
+            assert object_filtering.execute_filter_on_object(shape, parsed_filter) == object_filtering.execute_filter_on_object(shape, SHAPE_FILTER_3)
+        with pytest.raises(ValueError):
+            object_filtering.parse_filter(RULE_X)
+
+    def test_parse_filter_parameters(self, shape_big, shape_medium, shape_small, shape_filters):
+        for shape_filter in shape_filters:
+            parsed_filter = object_filtering.parse_filter(shape_filter)
+            for shape in (shape_big, shape_medium, shape_small):
+                assert object_filtering.execute_filter_on_object(shape, parsed_filter) == object_filtering.execute_filter_on_object(shape, shape_filter)
+        volume_filter = {"name": "Volume", "description": "", "priority": 0, "object_types": ["Shape"], "logical_expression": GROUP_1}
+        parsed_rule = object_filtering.parse_filter(volume_filter)["logical_expression"]["logical_expressions"][-1]
+        assert parsed_rule["parameters"] == (2, )    # frozen from [2]
+        assert object_filtering.is_rule_valid(parsed_rule, shape_big)
+
+    def test_compile_filter(self, shape_1, shape_big, shape_medium, shape_small, shape_filters):
+        for shape_filter in shape_filters:
+            for sample in (None, shape_1):
+                compiled_filter = object_filtering.compile_filter(shape_filter, sample)
+                assert compiled_filter(shape_big)
+                assert compiled_filter(shape_medium)
+                assert not compiled_filter(shape_small)
+        compiled_float_filter = object_filtering.compile_filter(SHAPE_FILTER_FLOAT, shape_1)    # a group of rules fused into one function
+        for shape in (Shape(1.0000002, 2), Shape(1.1, 2), Shape(1, 2.00001), Shape(float("inf"), 2)):
+            assert compiled_float_filter(shape) == object_filtering.execute_logical_expression_on_object(shape, SHAPE_FILTER_FLOAT["logical_expression"])
+        with pytest.raises(ValueError):
+            object_filtering.compile_filter(RULE_X)
+        with pytest.raises(AttributeError):
+            object_filtering.compile_filter(object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=RULE_SECRET), shape_1)
+
+    def test_compiled_filter_per_type(self, shape_big):
+        area_filter = object_filtering.ObjectFilter(object_types=["Shape", "Point"], logical_expression=RULE_AREA)
+        for _ in range(2):  # the second pass reuses the expressions compiled for each type
+            assert object_filtering.execute_filter_on_object(shape_big, area_filter) == object_filtering.execute_logical_expression_on_object(shape_big, RULE_AREA)
+            assert object_filtering.execute_filter_on_object(Point(10, 10), area_filter) == object_filtering.execute_logical_expression_on_object(Point(10, 10), RULE_AREA)
+
+    def test_compiled_filter_modified(self, shape_big):
+        area_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=dict(RULE_AREA))
+        assert object_filtering.execute_filter_on_object(shape_big, area_filter, sanitize=False)
+        area_filter["logical_expression"]["comparison_value"] = 100     # compiled expressions are cached by content, not by filter
+        assert not object_filtering.execute_filter_on_object(shape_big, area_filter, sanitize=False)
+
+        shadowed_shape = CountingShape(2, 2)
+        shadowed_shape.area = 100   # not a method, so the filter compares it directly
+        assert object_filtering.execute_filter_on_object(shadowed_shape, area_filter, sanitize=False)
+
+        area_filter["logical_expression"]["comparison_value"] = 4   # sanitized filters are also cached by content
+        assert object_filtering.execute_filter_on_object(shape_big, area_filter)
+        area_filter["logical_expression"]["criterion"] = "secret_method"
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_object(shape_big, area_filter)
+        area_filter["logical_expression"]["criterion"] = "area"
+        area_filter["description"] = "a" * object_filtering.MAX_FILTER_SIZE
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_object(shape_big, area_filter)
+
+    def test_filter_on_array(self, shape_big, shape_medium, shape_small, shape_filters):
+        shapes = np.array([shape_big, shape_medium, shape_small])
+        for shape_filter in shape_filters:
+            result = object_filtering.execute_filter_on_array(shapes, shape_filter)
+            assert result.dtype == bool
+            assert result.tolist() == [True, True, False]
+
+    def test_filter_on_wrapper_batch(self, shape_big, shape_medium, shape_small):
+        shapes = [shape_big, shape_medium, shape_small, CountingShape(3, 3)]   # CountingShape.area() has no vectorized twin
+        for shape_filter in (SHAPE_FILTER_1, SHAPE_FILTER_3, SHAPE_FILTER_5):
+            for wrapped in (shapes[:3], shapes):
+                expected = [object_filtering.execute_filter_on_object(shape, shape_filter) for shape in wrapped]
+                assert object_filtering.execute_filter_on_wrapper_batch(object_filtering.ObjectWrapper(wrapped), shape_filter).tolist() == expected
+        assert object_filtering.execute_filter_on_wrapper_batch(object_filtering.ObjectWrapper([]), SHAPE_FILTER_1).tolist() == []
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_wrapper_batch(object_filtering.ObjectWrapper([shape_big, Point(1, 2)]), SHAPE_FILTER_1)
+        with pytest.raises(TypeError):
+            object_filtering.execute_filter_on_wrapper_batch(object_filtering.ObjectWrapper(shape_big), SHAPE_FILTER_1)
+
+    def test_filter_on_wrapper_batch_large_ints(self):
+        area_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=object_filtering.Rule(criterion="area", operator=">=", comparison_value=4))
+        shapes = [Shape(2**40, 2**40), Shape(2**40, 2**40), Shape(2**62, 2), Shape(1, 1)]
+        expected = [object_filtering.execute_filter_on_object(shape, area_filter) for shape in shapes]
+        assert expected == [True, True, True, False]
+        assert object_filtering.execute_filter_on_wrapper_batch(object_filtering.ObjectWrapper(shapes), area_filter).tolist() == expected
+        assert object_filtering.execute_filter_on_array(np.array(shapes), area_filter).tolist() == expected
+
+    def test_compiled_filter(self, shape_1):
+        compiled = object_filtering.CompiledFilter.from_logical_expression(SHAPE_FILTER_1["logical_expression"], shape_1)
+        assert len(compiled.criteria) == len(compiled.op_codes) == len(compiled.executors)
+        assert compiled.op_codes.dtype == np.uint8
+        for i, executor in enumerate(compiled.executors):
+            assert compiled.vectorizable[i] == (not compiled.is_method[i])
+            assert executor(shape_1) in (True, False)
+
+    def test_float_comparison_on_array(self):
+        shapes = np.array([Shape(1.0000002, 2), Shape(1.1, 2), Shape(1, 2.00001), Shape(float("inf"), 2)])
+        assert object_filtering.execute_filter_on_array(shapes, SHAPE_FILTER_FLOAT).tolist() == [True, False, True, False]
+
+    def test_mixed_number_comparison_on_array(self):
+        rules = [
+            {"criterion": "x", "operator": "==", "comparison_value": 10**9, "parameters": [], "multi_value_behavior": "none"},
+            {"criterion": "x", "operator": "<=", "comparison_value": 2**53, "parameters": [], "multi_value_behavior": "none"},
+            {"criterion": "x", "operator": "==", "comparison_value": 2.0**53, "parameters": [], "multi_value_behavior": "none"},
+            {"criterion": "x", "operator": "<", "comparison_value": 10**30, "parameters": [], "multi_value_behavior": "none"},
+        ]
+        shape_arrays = (
+            [Shape(10**9 + 1, 1), Shape(0.5, 1)],   # ints are compared exactly even next to floats
+            [Shape(2**53 + 1, 1), Shape(2**53, 1), Shape(2**63 + 1, 1)],
+            [Shape(float(2**53), 1), Shape(1.5, 1)],
+        )
+        for rule in rules:
+            shape_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=rule)
+            for shapes in shape_arrays:
+                expected = [object_filtering.execute_filter_on_object(shape, shape_filter) for shape in shapes]
+                assert object_filtering.execute_filter_on_array(np.array(shapes), shape_filter).tolist() == expected
+        shape_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=rules[0])
+        assert object_filtering.execute_filter_on_array(np.array(shape_arrays[0]), shape_filter).tolist() == [False, False]
+
+    def test_large_array(self):
+        # large enough to use the numba kernel when numba is installed
+        shapes = np.array([Shape(i % 5, (i % 7) / 2) for i in range(object_filtering.NUMBA_MIN_ARRAY_SIZE)])
+        for shape_filter in (SHAPE_FILTER_1, SHAPE_FILTER_FLOAT, GROUP_FILTER_OR):
+            expected = [object_filtering.execute_filter_on_object(shape, shape_filter) for shape in shapes]
+            assert object_filtering.execute_filter_on_array(shapes, shape_filter).tolist() == expected
+
+    def test_large_array_unrepresentable_numbers(self):
+        # values that float64 cannot represent exactly are not passed to the numba kernel
+        size = object_filtering.NUMBA_MIN_ARRAY_SIZE
+        group = {"logical_operator": "and", "logical_expressions": [
+            {"criterion": "x", "operator": "<", "comparison_value": 10**400, "parameters": [], "multi_value_behavior": "none"},
+            {"criterion": "y", "operator": "==", "comparison_value": 1, "parameters": [], "multi_value_behavior": "none"},
+        ]}
+        shape_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=group)
+        shapes = np.array([Shape(i, 1 if i % 2 else 1.0000000001) for i in range(size)])
+        mixed_shapes = np.array([Shape(i, 1 if i % 2 else 1.5) for i in range(size)])
+        for shapes in (shapes, mixed_shapes):
+            expected = [object_filtering.execute_filter_on_object(shape, shape_filter) for shape in shapes]
+            assert object_filtering.execute_filter_on_array(shapes, shape_filter).tolist() == expected
+        group["logical_expressions"][0].update(operator="==", comparison_value=10**9)
+        mixed_shapes = np.array([Shape(10**9 + 1 if i % 2 else 0.5, 1) for i in range(size)])
+        assert not object_filtering.execute_filter_on_array(mixed_shapes, shape_filter).any()
+
+    def test_large_array_empty_group(self):
+        shapes = np.array([Shape(i, 1) for i in range(2 * object_filtering.NUMBA_MIN_ARRAY_SIZE)])
+        for logical_operator in ("and", "or"):
+            shape_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression={"logical_operator": logical_operator, "logical_expressions": []})
+            expected = object_filtering.execute_filter_on_object(shapes[0], shape_filter)
+            assert object_filtering.execute_filter_on_array(shapes, shape_filter).tolist() == [expected] * len(shapes)
+
+    def test_filter_on_array_type_check(self, shape_big):
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_array(np.array([shape_big, Point(3, 4)]), SHAPE_FILTER_1)
+
+    def test_filter_on_array_subclass(self, shape_big):
+        class OverridingShape(Shape):
+            __slots__ = ()
+
+            def area(self) -> int:  # overrides a whitelisted method without @filter_criterion
+                return 100
+
+        area_filter = object_filtering.ObjectFilter(object_types=["Shape"], logical_expression=RULE_AREA)
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_array(np.array([shape_big, OverridingShape(1, 1)]), area_filter)
+
+        shapes = [shape_big, CountingShape(1, 1), CountingShape(1, 1), CountingShape(1, 1)]
+        shapes[2].area = 100    # instance attributes shadow the method, like in get_value
+        expected = [object_filtering.execute_filter_on_object(shape, area_filter) for shape in shapes]
+        assert object_filtering.execute_filter_on_array(np.array(shapes), area_filter).tolist() == expected == [True, False, True, False]
+        shapes[3].area = shapes[3].secret_method
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_on_array(np.array(shapes), area_filter)
+
+    def test_filter_list_on_array_subclass(self, shape_big):
+        class OverridingShape(Shape):
+            __slots__ = ()
+
+            def area(self) -> int:  # overrides a whitelisted method without @filter_criterion
+                return 100
+
+        filter_list = [
+            object_filtering.ObjectFilter(name="x", object_types=["Shape"], logical_expression=RULE_X),
+            object_filtering.ObjectFilter(name="area", object_types=["Shape"], logical_expression=RULE_AREA),
+        ]
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_list_on_array(np.array([shape_big, OverridingShape(1, 1)]), filter_list)
+
+        shapes = [shape_big, CountingShape(1, 1), CountingShape(1, 1)]
+        shapes[2].area = 100
+        expected = [bool(object_filtering.execute_filter_list_on_object(shape, filter_list).all()) for shape in shapes]
+        assert object_filtering.execute_filter_list_on_array(np.array(shapes), filter_list).tolist() == expected
+
+    def test_filter_list_on_array(self, shape_big, shape_medium, shape_small):
+        shapes = np.array([shape_big, shape_medium, shape_small])
+        result = object_filtering.execute_filter_list_on_array(shapes, [SHAPE_FILTER_1, SHAPE_FILTER_3])
+        assert result.tolist() == [True, True, False]
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_list_on_array(np.array([shape_big, Point(3, 4)]), [SHAPE_FILTER_1])
+
     def test_float_comparison(self):
         shape_float_1 = Shape(1.0000002, 2)
         assert object_filtering.execute_filter_on_object(shape_float_1, SHAPE_FILTER_FLOAT)
 
-class TestLogicalExpressionClasses(unittest.TestCase):
-    def test_init(self):
+    def test_comparison_types(self):
+        assert object_filtering.ABS_TOL == Decimal("0.0001")
+        assert object_filtering.criterion_comparison(2.00000001, "==", 2)    # float values keep their tolerance against int comparison values
+        assert object_filtering.criterion_comparison(Decimal("1.00001"), "<=", 1.0)
+        assert not object_filtering.criterion_comparison(1.001, "<=", 1.0)
+        assert object_filtering.criterion_comparison("b", ">", "a")
+        with pytest.raises(ValueError):
+            object_filtering.criterion_comparison(1, "=>", 1)
+
+class TestSanitization:
+    def test_sanitize_string(self):
+        assert object_filtering.sanitize_string("Shape Size") == "Shape Size"
+        assert object_filtering.sanitize_string("Sh\tape\x7f Si\u00e9ze\U0001f600") == "Shape Size"
+        assert object_filtering.sanitize_string("") == ""
+
+    def test_sanitize_filter(self):
+        unsanitized_filter = dict(SHAPE_FILTER_5, name="Shape\u00e9", logical_expression=dict(SHAPE_FILTER_5["logical_expression"], criterion="ar\nea"))
+        sanitized_filter = object_filtering.sanitize_filter(unsanitized_filter)
+        assert sanitized_filter["name"] == "Shape"
+        assert sanitized_filter["logical_expression"]["criterion"] == "area"
+        assert sanitized_filter == object_filtering.sanitize_filter(SHAPE_FILTER_5) | {"name": "Shape"}
+        unsanitized_filter["name"] = "Circle"   # filters are sanitized again on every call
+        assert object_filtering.sanitize_filter(unsanitized_filter)["name"] == "Circle"
+        assert object_filtering.sanitize_filter({"_hint": "ke\tpt"}) == {"_hint": "kept"}
+
+        sanitized_group = object_filtering.sanitize_filter(SHAPE_FILTER_1)["logical_expression"]
+        assert sanitized_group == SHAPE_FILTER_1["logical_expression"]
+        assert sanitized_group["logical_expressions"] is not SHAPE_FILTER_1["logical_expression"]["logical_expressions"]
+        assert sanitized_group["logical_expressions"][0] is not SHAPE_FILTER_1["logical_expression"]["logical_expressions"][0]
+        with pytest.raises(TypeError):
+            object_filtering.sanitize_filter("filter")
+
+class TestLogicalExpressionClasses:
+    def test_init(self, shape_1):
         object_filter = object_filtering.ObjectFilter("test", "test description", 0, ["object"], True)
         assert isinstance(object_filter, object_filtering.ObjectFilter)
         assert isinstance(object_filter, object_filtering.LogicalExpression)
@@ -612,7 +1103,7 @@ class TestLogicalExpressionClasses(unittest.TestCase):
         rule = object_filtering.Rule("area", "==", 2, [], "none")
         assert isinstance(rule, object_filtering.Rule)
         assert isinstance(rule, object_filtering.LogicalExpression)
-        assert object_filtering.execute_rule_on_object(SHAPE_1, rule)
+        assert object_filtering.execute_rule_on_object(shape_1, rule)
         assert {"rule": rule}
 
         group_expression = object_filtering.GroupExpression("or", [True, False])
@@ -627,7 +1118,7 @@ class TestLogicalExpressionClasses(unittest.TestCase):
         assert object_filtering.execute_conditional_expression_on_object("test", conditional_expression)
         assert {"conditional_expression": conditional_expression}
 
-class TestMixedTypeFilters(unittest.TestCase):
+class TestMixedTypeFilters:
     def test_mixed_type_filter(self):
         shape = Shape(2, 2)
         point = Point(2, 2)
@@ -637,21 +1128,43 @@ class TestMixedTypeFilters(unittest.TestCase):
         assert object_filtering.is_filter_valid(MIXED_FILTER, wrapper)
         assert object_filtering.execute_filter_on_object(wrapper, MIXED_FILTER)
 
-class TestFilterList(unittest.TestCase):
-    def test_filter_list_get_first_success(self):
+class TestFilterList:
+    def test_filter_list_get_first_success(self, high_x_filter, high_y_filter):
         shape_1 = Shape(10, 0)
         shape_2 = Shape(0, 10)
         shape_3 = Shape(0, 0)
-        filter_list = [HIGH_X_FILTER, HIGH_Y_FILTER]
+        filter_list = [high_x_filter, high_y_filter]
         assert object_filtering.execute_filter_list_on_object_get_first_success(shape_1, filter_list) == "High X"
         assert object_filtering.execute_filter_list_on_object_get_first_success(shape_2, filter_list) == "High Y"
         with pytest.raises(ValueError):
             object_filtering.execute_filter_list_on_object_get_first_success(shape_3, filter_list)
 
-    def test_sort_filter_list(self):
-        filter_list = [LOW_Y_FILTER, HIGH_Y_FILTER, HIGH_X_FILTER]
+        # filters after the first success are not executed, so the invalid filter is never reached
+        secret_filter = object_filtering.ObjectFilter(name="Secret", priority=10, object_types=["Shape"], logical_expression=RULE_SECRET)
+        assert object_filtering.execute_filter_list_on_object_get_first_success(shape_1, [secret_filter, high_x_filter]) == "High X"
+        with pytest.raises(ValueError):
+            object_filtering.execute_filter_list_on_object_get_first_success(shape_3, [secret_filter, high_x_filter])
+
+    def test_filter_list_on_array_shared_criteria(self):
+        shapes = np.array([CountingShape(3, 4), CountingShape(2, 2), CountingShape(1, 1)])
+        CountingShape.area_calls = 0
+        result = object_filtering.execute_filter_list_on_array(shapes, [SHAPE_FILTER_1, SHAPE_FILTER_5])
+        assert result.tolist() == [True, True, False]
+        assert CountingShape.area_calls <= len(shapes)    # area() is shared by both filters but fetched once per object
+
+    def test_sort_filter_list(self, low_y_filter, high_y_filter, high_x_filter):
+        filter_list = [low_y_filter, high_y_filter, high_x_filter]
         filter_list = object_filtering.sort_filter_list(filter_list)
-        assert filter_list == [HIGH_X_FILTER, HIGH_Y_FILTER, LOW_Y_FILTER]
+        assert filter_list == [high_x_filter, high_y_filter, low_y_filter]
+
+    def test_sort_filter_list_cache(self, low_y_filter, high_y_filter, high_x_filter):
+        filter_list = [low_y_filter, high_y_filter]
+        assert object_filtering.sort_filter_list(filter_list) == [high_y_filter, low_y_filter]
+        filter_list.append(high_x_filter)   # changing the list invalidates its cached order
+        sorted_list = object_filtering.sort_filter_list(filter_list)
+        assert sorted_list == [high_x_filter, high_y_filter, low_y_filter]
+        sorted_list.pop()   # the cached order is not shared with callers
+        assert object_filtering.sort_filter_list(filter_list) == [high_x_filter, high_y_filter, low_y_filter]
 
 if __name__ == '__main__':
     pytest.main()